@@ -14,12 +14,21 @@ Endpoints:
 """
 
 import json
+import re
 import uuid
 import platform
 from datetime import datetime
 from pathlib import Path
 from flask import Blueprint, request, jsonify, current_app, send_file, Response
 from app.services.html_renderer import render_document_html, render_precedent_html
+from app.services.source_cache import release_source
+
+# Try importing orjson for faster JSON I/O on large documents/analyses
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
 
 api_bp = Blueprint('api', __name__)
 
@@ -49,6 +58,68 @@ def _normalize_path(p: str | None) -> str | None:
 # Session storage (in-memory for now, could use Redis/DB for production)
 sessions = {}
 
+# Leading section number of a section_ref (e.g. "12" in "12.3(a)")
+_SECTION_NUM_RE = re.compile(r'^(\d+)')
+
+
+def _section_sort_key(section_ref: str):
+    """Sort key ordering section refs numerically by their leading number."""
+    m = _SECTION_NUM_RE.match(section_ref)
+    return (int(m.group(1)) if m else 999, section_ref)
+
+
+def _paragraphs_by_id(parsed_doc) -> dict:
+    """Index a parsed document's top-level paragraphs by paragraph ID."""
+    return {
+        item.get('id'): item
+        for item in parsed_doc.get('content', [])
+        if item.get('type') == 'paragraph'
+    }
+
+
+def load_json(path):
+    """Load a JSON file, using orjson when available."""
+    if HAS_ORJSON:
+        return orjson.loads(Path(path).read_bytes())
+    # Single read of the whole file; json.loads decodes the bytes itself
+    return json.loads(Path(path).read_bytes())
+
+
+JSON_WRITE_BUFFER_SIZE = 1 << 20
+
+
+def save_json(data, path, default=None, pretty=True):
+    """
+    Write data to a JSON file, using orjson when available.
+
+    Args:
+        data: JSON-serializable data
+        path: Output file path
+        default: Fallback serializer for unsupported types
+        pretty: Indent by 2 spaces; pass False for compact machine-read files
+    """
+    if HAS_ORJSON:
+        option = orjson.OPT_NON_STR_KEYS
+        if pretty:
+            option |= orjson.OPT_INDENT_2
+        if default is not None:
+            # Route datetimes through default to match stdlib output
+            option |= orjson.OPT_PASSTHROUGH_DATETIME
+        Path(path).write_bytes(orjson.dumps(data, default=default, option=option))
+        return
+    # Stream encoder chunks through a large buffer rather than building the
+    # whole document as one string first
+    with open(path, 'w', encoding='utf-8', buffering=JSON_WRITE_BUFFER_SIZE) as f:
+        if pretty:
+            json.dump(data, f, indent=2, ensure_ascii=False, default=default)
+        else:
+            json.dump(data, f, separators=(',', ':'), ensure_ascii=False, default=default)
+
+
+def _session_path(session_id) -> Path:
+    """On-disk location of a saved session."""
+    return current_app.config['SESSION_FOLDER'] / f'{session_id}.json'
+
 
 def get_session(session_id):
     """Get session data or return error."""
@@ -61,13 +132,17 @@ def save_session(session_id, data):
     """Save session data."""
     sessions[session_id] = data
     # Also persist to disk
-    session_path = current_app.config['SESSION_FOLDER'] / f'{session_id}.json'
-    with open(session_path, 'w', encoding='utf-8') as f:
-        # Convert non-serializable objects
-        serializable = {k: v for k, v in data.items() if k != 'parsed_doc'}
-        if 'parsed_doc' in data:
-            serializable['parsed_doc_path'] = str(data.get('parsed_doc_path', ''))
-        json.dump(serializable, f, indent=2, default=str)
+    session_path = _session_path(session_id)
+    # Convert non-serializable objects; parsed documents already saved on
+    # disk are stored by path rather than re-serialized on every save
+    excluded = {'parsed_doc'}
+    if data.get('parsed_precedent_path'):
+        excluded.add('parsed_precedent')
+    serializable = {k: v for k, v in data.items() if k not in excluded}
+    if 'parsed_doc' in data:
+        serializable['parsed_doc_path'] = str(data.get('parsed_doc_path', ''))
+    # Saved on every revision/accept/flag and only read back by the app
+    save_json(serializable, session_path, default=str, pretty=False)
 
 
 @api_bp.route('/load-test-session', methods=['POST'])
@@ -85,11 +160,8 @@ def load_test_session():
         return jsonify({'error': 'No saved test data found. Run a full analysis first.'}), 404
 
     # Load saved data
-    with open(doc_path, 'r', encoding='utf-8') as f:
-        document = json.load(f)
-
-    with open(analysis_path, 'r', encoding='utf-8') as f:
-        analysis = json.load(f)
+    document = load_json(doc_path)
+    analysis = load_json(analysis_path)
 
     # Create a test session
     session_id = 'test-' + str(uuid.uuid4())[:8]
@@ -197,6 +269,7 @@ def intake():
         'parsed_doc': parsed_doc,
         'parsed_precedent': parsed_precedent,
         'parsed_doc_path': str(upload_folder / 'target_parsed.json'),
+        'parsed_precedent_path': str(upload_folder / 'precedent_parsed.json') if parsed_precedent else None,
         'analysis': None,
         'revisions': {},
         'flags': [],
@@ -204,13 +277,11 @@ def intake():
     }
 
     # Save parsed doc to disk
-    with open(session_data['parsed_doc_path'], 'w', encoding='utf-8') as f:
-        json.dump(parsed_doc, f, indent=2, ensure_ascii=False)
+    # Parsed documents are only read back by the app, so skip pretty-printing
+    save_json(parsed_doc, session_data['parsed_doc_path'], pretty=False)
 
     if parsed_precedent:
-        precedent_parsed_path = upload_folder / 'precedent_parsed.json'
-        with open(precedent_parsed_path, 'w', encoding='utf-8') as f:
-            json.dump(parsed_precedent, f, indent=2, ensure_ascii=False)
+        save_json(parsed_precedent, session_data['parsed_precedent_path'], pretty=False)
 
     save_session(session_id, session_data)
 
@@ -264,8 +335,7 @@ def get_document(session_id):
         # Try loading from disk
         parsed_path = session.get('parsed_doc_path')
         if parsed_path and Path(parsed_path).exists():
-            with open(parsed_path, 'r', encoding='utf-8') as f:
-                parsed_doc = json.load(f)
+            parsed_doc = load_json(parsed_path)
         else:
             return jsonify({'error': 'Document not found'}), 404
 
@@ -591,13 +661,10 @@ def revise():
     if not session:
         return jsonify({'error': 'Session not found'}), 404
 
-    # Find the paragraph
+    # Find the paragraph; related clauses are looked up in the same index
     parsed_doc = session.get('parsed_doc')
-    paragraph = None
-    for item in parsed_doc.get('content', []):
-        if item.get('type') == 'paragraph' and item.get('id') == para_id:
-            paragraph = item
-            break
+    paragraphs_by_id = _paragraphs_by_id(parsed_doc)
+    paragraph = paragraphs_by_id.get(para_id)
 
     if not paragraph:
         return jsonify({'error': 'Paragraph not found'}), 404
@@ -618,17 +685,16 @@ def revise():
     related_clauses_context = []
     if include_related_ids:
         for rel_id in include_related_ids:
-            for item in parsed_doc.get('content', []):
-                if item.get('type') == 'paragraph' and item.get('id') == rel_id:
-                    # Check if this clause has been revised
-                    revision_data = session.get('revisions', {}).get(rel_id)
-                    related_clauses_context.append({
-                        'id': rel_id,
-                        'section_ref': item.get('section_ref', ''),
-                        'text': item.get('text', ''),
-                        'revised_text': revision_data.get('revised') if revision_data and revision_data.get('accepted') else None
-                    })
-                    break
+            item = paragraphs_by_id.get(rel_id)
+            if item is not None:
+                # Check if this clause has been revised
+                revision_data = session.get('revisions', {}).get(rel_id)
+                related_clauses_context.append({
+                    'id': rel_id,
+                    'section_ref': item.get('section_ref', ''),
+                    'text': item.get('text', ''),
+                    'revised_text': revision_data.get('revised') if revision_data and revision_data.get('accepted') else None
+                })
 
     try:
         revision = generate_revision(
@@ -813,12 +879,9 @@ def reanalyze_clause():
     if not parsed_doc:
         return jsonify({'error': 'Document not found'}), 404
 
-    # Find the paragraph
-    paragraph = None
-    for item in parsed_doc.get('content', []):
-        if item.get('type') == 'paragraph' and item.get('id') == para_id:
-            paragraph = item
-            break
+    # Find the paragraph; related clauses are looked up in the same index
+    paragraphs_by_id = _paragraphs_by_id(parsed_doc)
+    paragraph = paragraphs_by_id.get(para_id)
 
     if not paragraph:
         return jsonify({'error': 'Paragraph not found'}), 404
@@ -841,8 +904,7 @@ def reanalyze_clause():
         for rel_id in related_ids:
             revision = session.get('revisions', {}).get(rel_id)
             if revision and revision.get('accepted'):
-                rel_para = next((p for p in parsed_doc['content']
-                                if p.get('id') == rel_id), None)
+                rel_para = paragraphs_by_id.get(rel_id)
                 if rel_para:
                     revised_context.append({
                         'id': rel_id,
@@ -1020,23 +1082,27 @@ def finalize_preview():
     if not session:
         return jsonify({'error': 'Session not found'}), 404
 
+    from app.services.document_service import build_paragraph_lookup
+
     revisions = session.get('revisions', {})
     parsed_doc = session.get('parsed_doc', {})
 
+    # Index paragraphs (including table cells) once instead of scanning per revision
+    content_by_id = build_paragraph_lookup(parsed_doc.get('content', []))
+
     revision_details = []
     for para_id, revision in revisions.items():
         if revision.get('accepted', False):
             # Find section reference from parsed_doc
             section_ref = None
             section_title = None
-            for item in parsed_doc.get('content', []):
-                if item.get('id') == para_id:
-                    section_ref = item.get('section_ref', '')
-                    # Get section title from hierarchy
-                    hierarchy = item.get('section_hierarchy', [])
-                    if hierarchy:
-                        section_title = hierarchy[-1].get('caption', '')
-                    break
+            item = content_by_id.get(para_id)
+            if item is not None:
+                section_ref = item.get('section_ref', '')
+                # Get section title from hierarchy
+                hierarchy = item.get('section_hierarchy', [])
+                if hierarchy:
+                    section_title = hierarchy[-1].get('caption', '')
 
             revision_details.append({
                 'para_id': para_id,
@@ -1143,6 +1209,20 @@ def implement_suggestion():
         return jsonify({'error': f'Implementation failed: {str(e)}'}), 500
 
 
+# Category label mapping
+_FLAG_CATEGORY_LABELS = {
+    'business-decision': 'Business Decision',
+    'risk-alert': 'Risk Alert',
+    'for-discussion': 'For Discussion',
+    'fyi': 'FYI',
+}
+# Flag type labels as fallback for older flags without category
+_FLAG_TYPE_LABELS = {
+    'client': 'Client Review',
+    'attorney': 'Attorney Note',
+}
+
+
 @api_bp.route('/transmittal/<session_id>', methods=['GET'])
 def get_transmittal(session_id):
     """
@@ -1176,21 +1256,8 @@ def get_transmittal(session_id):
     flags = session.get('flags', [])
     client_flags = [f for f in flags if f.get('flag_type') == 'client']
 
-    # Sort flags by section reference for logical ordering
-    client_flags.sort(key=lambda f: f.get('section_ref', ''))
-
-    # Category label mapping
-    category_labels = {
-        'business-decision': 'Business Decision',
-        'risk-alert': 'Risk Alert',
-        'for-discussion': 'For Discussion',
-        'fyi': 'FYI',
-    }
-    # Flag type labels as fallback for older flags without category
-    flag_type_labels = {
-        'client': 'Client Review',
-        'attorney': 'Attorney Note',
-    }
+    # Sort flags by section reference for logical ordering (2 before 10)
+    client_flags.sort(key=lambda f: _section_sort_key(f.get('section_ref') or ''))
 
     # Build the email body
     email_lines = []
@@ -1232,11 +1299,11 @@ def get_transmittal(session_id):
             note = flag.get('note', 'Flagged for review')
             # Use category label if present, fall back to flag_type label
             category = flag.get('category', '')
-            if category and category in category_labels:
-                label = category_labels[category]
+            if category and category in _FLAG_CATEGORY_LABELS:
+                label = _FLAG_CATEGORY_LABELS[category]
             else:
                 flag_type = flag.get('flag_type', 'client')
-                label = flag_type_labels.get(flag_type, 'Review')
+                label = _FLAG_TYPE_LABELS.get(flag_type, 'Review')
             email_lines.append(f"{i}. [{section}] ({label}): {note}")
         email_lines.append("")
 
@@ -1285,23 +1352,25 @@ def list_saved_sessions():
     if session_folder.exists():
         for session_file in session_folder.glob('*.json'):
             try:
-                with open(session_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    # Get file modification time
-                    mtime = session_file.stat().st_mtime
-                    saved_sessions.append({
-                        'session_id': data.get('session_id', session_file.stem),
-                        'created_at': data.get('created_at'),
-                        'last_modified': datetime.fromtimestamp(mtime).isoformat(),
-                        'status': data.get('status'),
-                        'contract_type': data.get('contract_type'),
-                        'representation': data.get('representation'),
-                        'target_filename': data.get('target_filename', 'Unknown'),
-                        'revisions_count': len(data.get('revisions', {})),
-                        'flags_count': len(data.get('flags', []))
-                    })
-            except (json.JSONDecodeError, IOError):
-                # Skip corrupted files
+                data = load_json(session_file)
+                if not isinstance(data, dict):
+                    continue
+                # Get file modification time
+                mtime = session_file.stat().st_mtime
+                saved_sessions.append({
+                    'session_id': data.get('session_id', session_file.stem),
+                    'created_at': data.get('created_at'),
+                    'last_modified': datetime.fromtimestamp(mtime).isoformat(),
+                    'status': data.get('status'),
+                    'contract_type': data.get('contract_type'),
+                    'representation': data.get('representation'),
+                    'target_filename': data.get('target_filename', 'Unknown'),
+                    'revisions_count': len(data.get('revisions') or {}),
+                    'flags_count': len(data.get('flags') or [])
+                })
+            except (ValueError, IOError):
+                # Skip corrupted files (decode errors from either JSON
+                # backend, including bad UTF-8, are ValueErrors)
                 continue
 
     # Sort by last modified (most recent first)
@@ -1343,13 +1412,14 @@ def discard_session(session_id):
     Removes session from memory and deletes the saved JSON file
     from disk if it exists.
     """
-    found = session_id in sessions
+    session = sessions.pop(session_id, None)
+    found = session is not None
     if found:
-        del sessions[session_id]
+        # Let go of matcher/retriever fits built over this session's precedent
+        release_source((session.get('parsed_precedent') or {}).get('content'))
 
     # Also remove from disk
-    session_folder = current_app.config['SESSION_FOLDER']
-    session_path = session_folder / f'{session_id}.json'
+    session_path = _session_path(session_id)
     if session_path.exists():
         session_path.unlink()
         found = True
@@ -1371,26 +1441,28 @@ def load_saved_session(session_id):
 
     Restores session to memory for continued work.
     """
-    session_folder = current_app.config['SESSION_FOLDER']
-    session_path = session_folder / f'{session_id}.json'
+    session_path = _session_path(session_id)
 
     if not session_path.exists():
         return jsonify({'error': 'Saved session not found'}), 404
 
     try:
-        with open(session_path, 'r', encoding='utf-8') as f:
-            session_data = json.load(f)
+        session_data = load_json(session_path)
 
         # Normalize Windows<->WSL paths before restoring
-        for path_key in ('parsed_doc_path', 'target_path', 'precedent_path'):
+        for path_key in ('parsed_doc_path', 'parsed_precedent_path', 'target_path', 'precedent_path'):
             if session_data.get(path_key):
                 session_data[path_key] = _normalize_path(session_data[path_key])
 
         # Restore parsed document if path exists
         parsed_doc_path = session_data.get('parsed_doc_path')
         if parsed_doc_path and Path(parsed_doc_path).exists():
-            with open(parsed_doc_path, 'r', encoding='utf-8') as f:
-                session_data['parsed_doc'] = json.load(f)
+            session_data['parsed_doc'] = load_json(parsed_doc_path)
+
+        # Restore parsed precedent stored by reference
+        parsed_precedent_path = session_data.get('parsed_precedent_path')
+        if 'parsed_precedent' not in session_data and parsed_precedent_path and Path(parsed_precedent_path).exists():
+            session_data['parsed_precedent'] = load_json(parsed_precedent_path)
 
         # Store in memory
         sessions[session_id] = session_data
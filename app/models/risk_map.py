@@ -161,6 +161,21 @@ class RiskMap:
                 affected.append(risk)
         return affected
 
+    def get_affected_risks_index(self) -> Dict[str, List[Risk]]:
+        """
+        Map each mitigator/amplifier ref to the risks it affects.
+
+        Equivalent to calling get_affected_risks for every ref, built in one
+        pass over the risks.
+        """
+        index: Dict[str, List[Risk]] = {}
+        for risk in self.risks.values():
+            refs = [m['ref'] for m in risk.mitigated_by]
+            refs += [a['ref'] for a in risk.amplified_by]
+            for ref in dict.fromkeys(refs):
+                index.setdefault(ref, []).append(risk)
+        return index
+
     def to_matrix_format(self, risk_ids: List[str] = None) -> str:
         """Format risks as matrix for LLM prompt."""
         if risk_ids is None:
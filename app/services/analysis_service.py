@@ -251,6 +251,7 @@ UNIVERSAL_RISKS = [
     },
     {
         'pattern': r'(?:default|breach).*?(?:terminate|remedies)',
+        'requires': (('default', 'breach'), ('terminate', 'remedies')),
         'exclude': r'(?:cure|notice\s+and\s+opportunity|right\s+to\s+cure)',
         'type': 'no_cure_period',
         'category': 'default',
@@ -266,6 +267,7 @@ UNIVERSAL_RISKS = [
     },
     {
         'pattern': r'(?:waive|waiver).*?(?:all|any\s+and\s+all)\s+(?:rights|claims|defenses)',
+        'requires': (('waive',), ('rights', 'claims', 'defenses')),
         'type': 'broad_waiver',
         'category': 'waivers',
         'severity': 'high',
@@ -273,6 +275,7 @@ UNIVERSAL_RISKS = [
     },
     {
         'pattern': r'(?:assign|transfer).*?(?:without\s+consent|freely)',
+        'requires': (('assign', 'transfer'), ('consent', 'freely')),
         'type': 'free_assignment',
         'category': 'assignment',
         'severity': 'medium',
@@ -280,6 +283,7 @@ UNIVERSAL_RISKS = [
     },
     {
         'pattern': r'(?:modify|amend|change).*?(?:sole\s+discretion|unilaterally)',
+        'requires': (('modify', 'amend', 'change'), ('discretion', 'unilaterally')),
         'type': 'unilateral_modification',
         'category': 'modifications',
         'severity': 'high',
@@ -317,6 +321,57 @@ UNIVERSAL_RISKS = [
 ]
 
 
+def _scan_paragraph_risks(
+    item: Dict,
+    all_patterns: List[Dict],
+    party_terms: Dict[str, List[str]],
+    representation: str,
+    risks: List[Dict]
+) -> None:
+    """
+    Run every risk pattern against one paragraph, appending matches to risks.
+    """
+    text = item.get('text', '')
+    text_lower = text.lower()
+    para_id = item.get('id', '')
+    section_ref = item.get('section_ref', '')
+    hierarchy = item.get('section_hierarchy', [])
+
+    for pattern_config in all_patterns:
+        pattern = pattern_config['pattern']
+        exclude = pattern_config.get('exclude')
+
+        # Cheap substring gate: skip the regex when a required term is absent
+        requires = pattern_config.get('requires')
+        if requires and not all(
+            any(term in text_lower for term in group) for group in requires
+        ):
+            continue
+
+        # Check exclusion first
+        if exclude and re.search(exclude, text_lower, re.IGNORECASE):
+            continue
+
+        # Check pattern match
+        if re.search(pattern, text_lower, re.IGNORECASE):
+            # Determine if this affects our client
+            affects_client = check_affects_client(text_lower, party_terms, representation)
+
+            risks.append({
+                'risk_id': f'R{len(risks) + 1}',
+                'type': pattern_config['type'],
+                'category': pattern_config.get('category', 'general'),
+                'severity': pattern_config['severity'],
+                'description': pattern_config['description'],
+                'location': section_ref or para_id,
+                'para_id': para_id,
+                'section_hierarchy': hierarchy,
+                'excerpt': text[:200] + ('...' if len(text) > 200 else ''),
+                'affects_client': affects_client,
+                'is_opportunity': pattern_config.get('is_opportunity', False)
+            })
+
+
 def detect_risks(
     parsed_doc: Dict,
     contract_type: str,
@@ -327,9 +382,6 @@ def detect_risks(
 
     Returns list of risk objects with location and severity.
     """
-    risks = []
-    risk_id = 0
-
     # Get contract-specific patterns
     skill = CONTRACT_SKILLS.get(contract_type, CONTRACT_SKILLS['general'])
     type_risks = skill.get('risks', [])
@@ -340,73 +392,59 @@ def detect_risks(
     # Determine which party terms to look for based on representation
     party_terms = get_party_terms(representation)
 
+    risks = []
     for item in parsed_doc.get('content', []):
         if item.get('type') != 'paragraph':
             continue
-
-        text = item.get('text', '')
-        text_lower = text.lower()
-        para_id = item.get('id', '')
-        section_ref = item.get('section_ref', '')
-        hierarchy = item.get('section_hierarchy', [])
-
-        for pattern_config in all_patterns:
-            pattern = pattern_config['pattern']
-            exclude = pattern_config.get('exclude')
-
-            # Check exclusion first
-            if exclude and re.search(exclude, text_lower, re.IGNORECASE):
-                continue
-
-            # Check pattern match
-            if re.search(pattern, text_lower, re.IGNORECASE):
-                risk_id += 1
-
-                # Determine if this affects our client
-                affects_client = check_affects_client(text_lower, party_terms, representation)
-
-                risks.append({
-                    'risk_id': f'R{risk_id}',
-                    'type': pattern_config['type'],
-                    'category': pattern_config.get('category', 'general'),
-                    'severity': pattern_config['severity'],
-                    'description': pattern_config['description'],
-                    'location': section_ref or para_id,
-                    'para_id': para_id,
-                    'section_hierarchy': hierarchy,
-                    'excerpt': text[:200] + ('...' if len(text) > 200 else ''),
-                    'affects_client': affects_client,
-                    'is_opportunity': pattern_config.get('is_opportunity', False)
-                })
+        _scan_paragraph_risks(item, all_patterns, party_terms, representation, risks)
 
     return risks
 
 
+# Client and counterparty terms by representation
+_PARTY_TERMS = {
+    'seller': {'client': ['seller', 'grantor', 'vendor'], 'counterparty': ['buyer', 'purchaser', 'grantee']},
+    'buyer': {'client': ['buyer', 'purchaser', 'grantee'], 'counterparty': ['seller', 'grantor', 'vendor']},
+    'landlord': {'client': ['landlord', 'lessor', 'owner'], 'counterparty': ['tenant', 'lessee']},
+    'tenant': {'client': ['tenant', 'lessee'], 'counterparty': ['landlord', 'lessor', 'owner']},
+    'lender': {'client': ['lender', 'bank', 'holder'], 'counterparty': ['borrower', 'debtor']},
+    'borrower': {'client': ['borrower', 'debtor'], 'counterparty': ['lender', 'bank', 'holder']},
+    'grantor': {'client': ['grantor', 'owner'], 'counterparty': ['grantee', 'holder']},
+    'grantee': {'client': ['grantee', 'holder'], 'counterparty': ['grantor', 'owner']},
+    'developer': {'client': ['developer', 'owner'], 'counterparty': ['municipality', 'city', 'county']}
+}
+
+
 def get_party_terms(representation: str) -> Dict[str, List[str]]:
     """Get party terms based on representation."""
-    party_map = {
-        'seller': {'client': ['seller', 'grantor', 'vendor'], 'counterparty': ['buyer', 'purchaser', 'grantee']},
-        'buyer': {'client': ['buyer', 'purchaser', 'grantee'], 'counterparty': ['seller', 'grantor', 'vendor']},
-        'landlord': {'client': ['landlord', 'lessor', 'owner'], 'counterparty': ['tenant', 'lessee']},
-        'tenant': {'client': ['tenant', 'lessee'], 'counterparty': ['landlord', 'lessor', 'owner']},
-        'lender': {'client': ['lender', 'bank', 'holder'], 'counterparty': ['borrower', 'debtor']},
-        'borrower': {'client': ['borrower', 'debtor'], 'counterparty': ['lender', 'bank', 'holder']},
-        'grantor': {'client': ['grantor', 'owner'], 'counterparty': ['grantee', 'holder']},
-        'grantee': {'client': ['grantee', 'holder'], 'counterparty': ['grantor', 'owner']},
-        'developer': {'client': ['developer', 'owner'], 'counterparty': ['municipality', 'city', 'county']}
-    }
-    return party_map.get(representation.lower(), {'client': [], 'counterparty': []})
+    return _PARTY_TERMS.get(representation.lower(), {'client': [], 'counterparty': []})
+
+
+# Compiled client-obligation patterns keyed by the client term tuple
+_CLIENT_OBLIGATION_RE_CACHE: Dict[tuple, Any] = {}
+
+
+def _client_obligation_re(terms: tuple):
+    """All client terms and both obligation/liability contexts as one pattern."""
+    pattern = _CLIENT_OBLIGATION_RE_CACHE.get(terms)
+    if pattern is None:
+        pattern = re.compile(
+            rf'(?:{"|".join(terms)})'
+            r'(?:\s+(?:shall|must|will|agrees?\s+to)'
+            r'|[\'s]*\s+(?:liability|indemnif|obligation))',
+            re.IGNORECASE
+        )
+        _CLIENT_OBLIGATION_RE_CACHE[terms] = pattern
+    return pattern
 
 
 def check_affects_client(text: str, party_terms: Dict, representation: str) -> bool:
     """Check if a risk affects the client (vs counterparty)."""
     # Look for client party terms in context that suggests obligation/liability
-    for term in party_terms.get('client', []):
-        if re.search(rf'{term}\s+(?:shall|must|will|agrees?\s+to)', text, re.IGNORECASE):
-            return True
-        if re.search(rf'{term}[\'s]*\s+(?:liability|indemnif|obligation)', text, re.IGNORECASE):
-            return True
-    return False
+    terms = tuple(party_terms.get('client', []))
+    if not terms:
+        return False
+    return _client_obligation_re(terms).search(text) is not None
 
 
 def detect_opportunities(
@@ -553,28 +591,30 @@ def build_conceptual_map(parsed_doc: Dict) -> Dict:
     }
 
 
+# Topic patterns in priority order, compiled once; matched against lowercased text
+_TOPIC_PATTERNS = tuple((topic, re.compile(pattern)) for topic, pattern in (
+    ('representations', r'represent|warrant|certif'),
+    ('indemnification', r'indemnif|hold\s+harmless'),
+    ('default', r'default|breach|cure|remedies'),
+    ('closing', r'closing|settlement|consummat'),
+    ('price', r'purchase\s+price|consideration|payment'),
+    ('due_diligence', r'due\s+diligence|inspection|feasibility'),
+    ('title', r'title|survey|encumbrance'),
+    ('conditions', r'condition\s+precedent|contingenc'),
+    ('termination', r'terminat|cancel'),
+    ('confidentiality', r'confidential|non-?disclosure'),
+    ('notices', r'notice|notification'),
+    ('assignment', r'assign|transfer'),
+    ('miscellaneous', r'governing\s+law|jurisdiction|waiver|entire\s+agreement'),
+))
+
+
 def categorize_paragraph(text: str) -> Optional[str]:
     """Categorize a paragraph by its topic."""
     text_lower = text.lower()
 
-    topics = {
-        'representations': r'represent|warrant|certif',
-        'indemnification': r'indemnif|hold\s+harmless',
-        'default': r'default|breach|cure|remedies',
-        'closing': r'closing|settlement|consummat',
-        'price': r'purchase\s+price|consideration|payment',
-        'due_diligence': r'due\s+diligence|inspection|feasibility',
-        'title': r'title|survey|encumbrance',
-        'conditions': r'condition\s+precedent|contingenc',
-        'termination': r'terminat|cancel',
-        'confidentiality': r'confidential|non-?disclosure',
-        'notices': r'notice|notification',
-        'assignment': r'assign|transfer',
-        'miscellaneous': r'governing\s+law|jurisdiction|waiver|entire\s+agreement'
-    }
-
-    for topic, pattern in topics.items():
-        if re.search(pattern, text_lower):
+    for topic, pattern in _TOPIC_PATTERNS:
+        if pattern.search(text_lower):
             return topic
 
     return None
@@ -589,15 +629,21 @@ def extract_defined_terms(text: str) -> List[str]:
     return list(set(quoted + paren))
 
 
+# Cross-reference patterns, compiled once. Kept as separate scans: a single
+# alternation is slower under re and lets an Exhibit match swallow a
+# following Section/Article reference
+_CROSS_REF_PATTERNS = tuple(re.compile(pattern, re.IGNORECASE) for pattern in (
+    r'Section\s+\d+(?:\.\d+)*',     # Section X.X references
+    r'Article\s+[IVXLCDM\d]+',      # Article references
+    r'Exhibit\s+[A-Z0-9]+',         # Exhibit references
+))
+
+
 def find_cross_references(text: str) -> List[str]:
     """Find cross-references to other sections."""
     refs = []
-    # Section X.X references
-    refs.extend(re.findall(r'Section\s+\d+(?:\.\d+)*', text, re.IGNORECASE))
-    # Article references
-    refs.extend(re.findall(r'Article\s+[IVXLCDM\d]+', text, re.IGNORECASE))
-    # Exhibit references
-    refs.extend(re.findall(r'Exhibit\s+[A-Z0-9]+', text, re.IGNORECASE))
+    for pattern in _CROSS_REF_PATTERNS:
+        refs.extend(pattern.findall(text))
     return refs
 
 
@@ -622,14 +668,11 @@ def analyze_document(
     # Build conceptual map
     conceptual_map = build_conceptual_map(parsed_doc)
 
-    # Build risk map keyed by paragraph
+    # Build risk map keyed by paragraph and count by severity in one pass
     risk_by_para = defaultdict(list)
-    for risk in risks:
-        risk_by_para[risk['para_id']].append(risk)
-
-    # Count by severity
     severity_counts = defaultdict(int)
     for risk in risks:
+        risk_by_para[risk['para_id']].append(risk)
         severity_counts[risk['severity']] += 1
 
     return {
@@ -649,7 +692,7 @@ def analyze_document(
             'info_items': severity_counts['info'],
             'opportunities_count': len(opportunities),
             'sections_analyzed': len(parsed_doc.get('sections', [])),
-            'paragraphs_analyzed': len([c for c in parsed_doc.get('content', []) if c.get('type') == 'paragraph'])
+            'paragraphs_analyzed': sum(1 for c in parsed_doc.get('content', []) if c.get('type') == 'paragraph')
         }
     }
 
@@ -667,8 +710,8 @@ def generate_suggestions(
     suggestions = []
 
     # Analyze revision patterns
-    rejection_count = len([r for r in revisions.values() if not r.get('accepted')])
-    acceptance_count = len([r for r in revisions.values() if r.get('accepted')])
+    acceptance_count = sum(1 for r in revisions.values() if r.get('accepted'))
+    rejection_count = len(revisions) - acceptance_count
 
     if rejection_count > acceptance_count and acceptance_count > 0:
         suggestions.append({
@@ -706,8 +749,7 @@ def implement_improvement(suggestion_id: str) -> Dict:
 
     improvements = []
     if improvement_log.exists():
-        with open(improvement_log, 'r') as f:
-            improvements = json.load(f)
+        improvements = json.loads(improvement_log.read_bytes())
 
     improvements.append({
         'suggestion_id': suggestion_id,
@@ -715,7 +757,6 @@ def implement_improvement(suggestion_id: str) -> Dict:
     })
 
     improvement_log.parent.mkdir(parents=True, exist_ok=True)
-    with open(improvement_log, 'w') as f:
-        json.dump(improvements, f, indent=2)
+    improvement_log.write_text(json.dumps(improvements, indent=2), encoding='utf-8')
 
     return {'status': 'implemented', 'suggestion_id': suggestion_id}
@@ -0,0 +1,70 @@
+"""
+API Key Lookup
+
+Shared by the Gemini and Anthropic services. A key is taken from the first
+environment variable that is set; failing that, from a plain-text key file
+in the project root, the project .env file, or a dotfile in the home
+directory, in that order.
+"""
+
+import os
+from pathlib import Path
+from typing import Optional, Tuple
+
+_PROJECT_ROOT = Path(__file__).parent.parent.parent
+
+GEMINI_KEY_VARS = ("GEMINI_API_KEY", "GOOGLE_API_KEY")
+ANTHROPIC_KEY_VARS = ("ANTHROPIC_API_KEY",)
+
+# Key files checked in order when no environment variable is set
+_GEMINI_KEY_PATHS = (
+    _PROJECT_ROOT / 'api.txt',
+    _PROJECT_ROOT / '.env',
+    Path.home() / '.gemini_api_key',
+)
+_ANTHROPIC_KEY_PATHS = (
+    _PROJECT_ROOT / 'anthropic_api.txt',
+    _PROJECT_ROOT / '.env',
+    Path.home() / '.anthropic_api_key',
+)
+
+
+def find_api_key(env_vars: Tuple[str, ...], key_paths: Tuple[Path, ...]) -> Optional[str]:
+    """
+    Look up an API key in the environment, then in key files.
+
+    Args:
+        env_vars: Environment variable names, in priority order
+        key_paths: Key files to try; .txt files hold the bare key, any other
+                   file is read as .env lines of the form NAME=value
+
+    Returns:
+        The key, or None if no source provides one
+    """
+    for var in env_vars:
+        key = os.getenv(var)
+        if key:
+            return key
+
+    prefixes = tuple(f"{var}=" for var in env_vars)
+    for path in key_paths:
+        if path.exists():
+            content = path.read_text().strip()
+            if path.suffix == '.txt':
+                return content
+            # Parse .env format
+            for line in content.split('\n'):
+                if line.startswith(prefixes):
+                    return line.split('=', 1)[1].strip().strip('"\'')
+
+    return None
+
+
+def get_gemini_api_key() -> Optional[str]:
+    """Get Gemini API key from various sources."""
+    return find_api_key(GEMINI_KEY_VARS, _GEMINI_KEY_PATHS)
+
+
+def get_anthropic_api_key() -> Optional[str]:
+    """Get Anthropic API key from various sources."""
+    return find_api_key(ANTHROPIC_KEY_VARS, _ANTHROPIC_KEY_PATHS)
@@ -6,14 +6,13 @@ Uses Claude Opus 4.5 (thinking model) to perform deep contract analysis,
 identifying risks, opportunities, and providing nuanced legal insights.
 """
 
-import os
 import json
 import re
 import time
 import threading
-from pathlib import Path
 from typing import Dict, List, Any, Optional, Callable
 from datetime import datetime
+from app.services.api_keys import get_anthropic_api_key
 from app.services.content_filter import ContentFilter
 from app.services.initial_analyzer import run_initial_analysis
 from app.services.parallel_analyzer import run_forked_parallel_analysis
@@ -115,32 +114,19 @@ try:
 except ImportError:
     HAS_ANTHROPIC = False
 
+# Try importing orjson to serialize large prompt payloads natively
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
 
-def get_anthropic_api_key() -> Optional[str]:
-    """Get Anthropic API key from various sources."""
-    # Try environment variables
-    key = os.getenv("ANTHROPIC_API_KEY")
-    if key:
-        return key
-
-    # Try key files
-    key_paths = [
-        Path(__file__).parent.parent.parent / 'anthropic_api.txt',
-        Path(__file__).parent.parent.parent / '.env',
-        Path.home() / '.anthropic_api_key'
-    ]
-
-    for path in key_paths:
-        if path.exists():
-            content = path.read_text().strip()
-            if path.suffix == '.txt':
-                return content
-            # Parse .env format
-            for line in content.split('\n'):
-                if line.startswith('ANTHROPIC_API_KEY='):
-                    return line.split('=', 1)[1].strip().strip('"\'')
 
-    return None
+def _dumps_indented(data) -> str:
+    """Pretty-print data as JSON for embedding in a prompt."""
+    if HAS_ORJSON:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS).decode('utf-8')
+    return json.dumps(data, indent=2, ensure_ascii=False)
 
 
 def build_risk_analysis_prompt(
@@ -511,26 +497,30 @@ def parse_risk_response(response_text: str) -> Dict:
     return result
 
 
+# Risk categories in priority order, each with its keywords compiled into one
+# alternation so a risk type is scanned once per category
+_RISK_CATEGORY_PATTERNS = tuple(
+    (category, re.compile('|'.join(map(re.escape, keywords))))
+    for category, keywords in (
+        ('liability', ('liability', 'indemnif', 'damage')),
+        ('timing', ('time', 'deadline', 'period', 'schedule')),
+        ('discretionary', ('discretion', 'reasonable', 'subjective')),
+        ('representations', ('represent', 'warrant', 'certif')),
+        ('default', ('default', 'breach', 'cure', 'termination')),
+        ('assignment', ('assign', 'transfer')),
+        ('survival', ('surviv',)),
+    )
+)
+
+
 def categorize_risk(risk_type: str) -> str:
     """Categorize a risk type into a broader category."""
     risk_type_lower = risk_type.lower()
 
-    if any(term in risk_type_lower for term in ['liability', 'indemnif', 'damage']):
-        return 'liability'
-    elif any(term in risk_type_lower for term in ['time', 'deadline', 'period', 'schedule']):
-        return 'timing'
-    elif any(term in risk_type_lower for term in ['discretion', 'reasonable', 'subjective']):
-        return 'discretionary'
-    elif any(term in risk_type_lower for term in ['represent', 'warrant', 'certif']):
-        return 'representations'
-    elif any(term in risk_type_lower for term in ['default', 'breach', 'cure', 'termination']):
-        return 'default'
-    elif any(term in risk_type_lower for term in ['assign', 'transfer']):
-        return 'assignment'
-    elif any(term in risk_type_lower for term in ['surviv']):
-        return 'survival'
-    else:
-        return 'general'
+    for category, pattern in _RISK_CATEGORY_PATTERNS:
+        if pattern.search(risk_type_lower):
+            return category
+    return 'general'
 
 
 def analyze_document_with_llm(
@@ -973,7 +963,7 @@ Respond with a JSON array of risk objects. If no risks are found, respond with a
 {paragraph.get('text', '')}
 
 ## Document Structure for Reference
-{json.dumps(document_map, indent=2) if isinstance(document_map, dict) else str(document_map)[:2000]}
+{_dumps_indented(document_map) if isinstance(document_map, dict) else str(document_map)[:2000]}
 
 Analyze this clause and return a JSON array of risks."""
 
@@ -45,33 +45,42 @@ class ContentFilter:
     """
 
     # Patterns for content that should NEVER be analyzed
-    # These represent structural elements that contain no substantive legal risk
-    SKIP_PATTERNS = {
+    # These represent structural elements that contain no substantive legal risk.
+    # One alternation; the matching group's name is the skip reason.
+    SKIP_RE = re.compile(
         # Empty or whitespace-only paragraphs
-        'blank': r'^\s*$',
+        r'(?P<blank>^\s*$)'
         # Visual separators (horizontal rules, page breaks)
-        'page_break': r'^-{3,}$|^_{3,}$',
+        r'|(?P<page_break>^-{3,}$|^_{3,}$)'
         # Section headers without any content (e.g., "ARTICLE III" alone)
         # Matches: ARTICLE I, SECTION 5, ARTICLE XIV, etc.
-        'header_only': r'^(ARTICLE|SECTION)\s+[IVXLCDM\d]+\.?\s*$',
-    }
+        r'|(?P<header_only>^(ARTICLE|SECTION)\s+[IVXLCDM\d]+\.?\s*$)'
+    )
 
     # Patterns for content that should be skipped as they rarely contain legal risks
-    # These are boilerplate elements that are standard across contracts
-    CONDITIONAL_SKIP = {
+    # These are boilerplate elements that are standard across contracts.
+    # Combined into one case-insensitive pass; execution language may appear
+    # anywhere in the paragraph, so it is found via lookahead and takes
+    # precedence over the start-anchored forms.
+    CONDITIONAL_SKIP_RE = re.compile(
         # Signature block indicators - execution language
-        'signature_block': r'(?i)(IN WITNESS WHEREOF|EXECUTED AS OF|EXECUTED BY THE PARTIES)',
+        r'^(?:(?=.*?(?P<signature_block>IN WITNESS WHEREOF|EXECUTED AS OF|EXECUTED BY THE PARTIES))'
         # Notice address blocks - administrative information
-        'notice_address': r'(?i)^(If to (Seller|Buyer|Purchaser|Landlord|Tenant|Lender|Borrower|Grantor|Grantee|Developer):?\s*$|Attention:|Attn:|Address:)',
+        r'|(?P<notice_address>If to (Seller|Buyer|Purchaser|Landlord|Tenant|Lender|Borrower|Grantor|Grantee|Developer):?\s*$|Attention:|Attn:|Address:)'
         # Exhibit section headers
-        'exhibit_header': r'(?i)^EXHIBIT\s+[A-Z0-9]+\s*[-:]?\s*$',
-    }
+        r'|(?P<exhibit_header>EXHIBIT\s+[A-Z0-9]+(?:\s*[-:])?\s*$))',
+        re.IGNORECASE | re.DOTALL
+    )
 
     # Pattern that marks the START of an exhibit section
     # Once matched, all subsequent paragraphs are considered exhibit content
     # until the end of the document (unless we implement exhibit boundary detection)
-    # Note: Use re.IGNORECASE flag at match time instead of inline (?i) to avoid position issues
-    EXHIBIT_START = r'^EXHIBIT\s+[A-Z0-9]+\s*[-:]?\s*$'
+    # The separator's leading whitespace is grouped with it so trailing spaces
+    # cannot be split between two \s* runs (quadratic backtracking on a miss).
+    EXHIBIT_START_RE = re.compile(r'^EXHIBIT\s+[A-Z0-9]+(?:\s*[-:])?\s*$', re.IGNORECASE)
+
+    # Blank definition placeholders, e.g. "1.3 'Broker' means ____."
+    BLANK_DEFINITION_RE = re.compile(r'^[\d.]+\s*"[^"]+"\s+means\s+_+\.?\s*$')
 
     def __init__(self, include_exhibits: bool = False):
         """
@@ -110,12 +119,12 @@ class ContentFilter:
             return (False, 'too_short')
 
         # Check absolute skip patterns (structural elements)
-        for name, pattern in self.SKIP_PATTERNS.items():
-            if re.match(pattern, text):
-                return (False, name)
+        match = self.SKIP_RE.match(text)
+        if match:
+            return (False, match.lastgroup)
 
         # Check if we're entering an exhibit section
-        if re.match(self.EXHIBIT_START, text, re.IGNORECASE):
+        if self.EXHIBIT_START_RE.match(text):
             self.in_exhibit_section = True
             if not self.include_exhibits:
                 return (False, 'exhibit_header')
@@ -125,14 +134,14 @@ class ContentFilter:
             return (False, 'exhibit_content')
 
         # Check conditional skip patterns (boilerplate elements)
-        for name, pattern in self.CONDITIONAL_SKIP.items():
-            if re.search(pattern, text):
-                # Signature blocks and notice addresses rarely have legal risks
-                return (False, name)
+        match = self.CONDITIONAL_SKIP_RE.match(text)
+        if match:
+            # Signature blocks and notice addresses rarely have legal risks
+            return (False, match.lastgroup)
 
         # Check for blank definition placeholders
         # e.g., "1.3 'Broker' means ____."
-        if re.match(r'^[\d.]+\s*"[^"]+"\s+means\s+_+\.?\s*$', text):
+        if self.BLANK_DEFINITION_RE.match(text):
             return (False, 'blank_definition')
 
         # Paragraph passes all filters - should be analyzed
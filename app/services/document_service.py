@@ -6,9 +6,11 @@ Handles document parsing, rebuilding, and track changes generation.
 Wraps functionality from parse_docx.py and rebuild_docx.py.
 """
 
+import io
 import json
-import shutil
+import sys
 import re
+from collections import Counter
 from pathlib import Path
 from datetime import datetime
 from typing import Dict, List, Any, Optional
@@ -25,64 +27,138 @@ try:
 except ImportError:
     HAS_REDLINES = False
 
+# Qualified tag names for block iteration and numbering lookups, resolved
+# once at import
+_W_P = qn('w:p')
+_W_TBL = qn('w:tbl')
+_W_PPR = qn('w:pPr')
+_W_NUMPR = qn('w:numPr')
+_W_ILVL = qn('w:ilvl')
+_W_NUMID = qn('w:numId')
+_W_VAL = qn('w:val')
 
-def get_paragraph_style_info(paragraph):
-    """Extract style information from a paragraph."""
-    style_name = paragraph.style.name if paragraph.style else "Normal"
+
+def get_paragraph_style_info(paragraph, style_names: Optional[Dict] = None):
+    """
+    Extract style information from a paragraph.
+
+    Resolving paragraph.style looks the style up in the styles part on every
+    call. Pass a per-document style_names dict to memoize the name and heading
+    flag by the paragraph's style ID (None for the default style).
+    """
+    if style_names is None:
+        style_name, is_heading = _style_name_and_heading(paragraph)
+    else:
+        style_id = paragraph._p.style
+        cached = style_names.get(style_id)
+        if cached is None:
+            cached = style_names[style_id] = _style_name_and_heading(paragraph)
+        style_name, is_heading = cached
 
     numbering_info = None
-    if paragraph._p.pPr is not None:
-        numPr = paragraph._p.pPr.find(qn('w:numPr'))
+    pPr = paragraph._p.find(_W_PPR)
+    if pPr is not None:
+        numPr = pPr.find(_W_NUMPR)
         if numPr is not None:
-            ilvl = numPr.find(qn('w:ilvl'))
-            numId = numPr.find(qn('w:numId'))
+            ilvl = numPr.find(_W_ILVL)
+            numId = numPr.find(_W_NUMID)
             if ilvl is not None and numId is not None:
                 numbering_info = {
-                    "level": int(ilvl.get(qn('w:val'))),
-                    "numId": numId.get(qn('w:val'))
+                    "level": int(ilvl.get(_W_VAL)),
+                    "numId": numId.get(_W_VAL)
                 }
 
     return {
         "style": style_name,
         "numbering": numbering_info,
-        "is_heading": style_name.lower().startswith("heading")
+        "is_heading": is_heading
     }
 
 
+def _style_name_and_heading(paragraph):
+    """Resolved style name of a paragraph ("Normal" if it has none) and whether it is a heading."""
+    style = paragraph.style
+    style_name = style.name if style else "Normal"
+    return style_name, style_name.lower().startswith("heading")
+
+
+# Section number forms as one alternation, tried in order. Each alternative
+# is wrapped in a group named for its num_type (so match.lastgroup gives the
+# type) with <type>_num and <type>_rest sub-groups. Article/section headings
+# ignore case.
+_SECTION_NUMBER_RE = re.compile(r"""
+    ^(?:
+        (?P<article>(?P<article_num>(?i:ARTICLE\s+(?:[IVXLCDM]+|\d+)))[.\s:]+(?P<article_rest>.*))
+      | (?P<section>(?P<section_num>(?i:SECTION\s+\d+(?:\.[\d.A-Za-z()]+)?))[.\s:]+(?P<section_rest>.*))
+      | (?P<subsub>(?P<subsub_num>\d+\.\d+\.\d+\.?\s*)(?P<subsub_rest>.*))
+      | (?P<sub>(?P<sub_num>\d+\.\d+\.?\s*)(?P<sub_rest>.*))
+      | (?P<top>(?P<top_num>\d+\.)\s+(?P<top_rest>.*))
+      | (?P<letter_upper>(?P<letter_upper_num>[A-Z]\.)\s+(?P<letter_upper_rest>.*))
+      | (?P<letter_lower>(?P<letter_lower_num>[a-z]\.)\s+(?P<letter_lower_rest>.*))
+      | (?P<paren_upper>\((?P<paren_upper_num>[A-Z])\)\s*(?P<paren_upper_rest>.*))
+      | (?P<paren_lower>\((?P<paren_lower_num>[a-z])\)\s*(?P<paren_lower_rest>.*))
+      | (?P<paren_num>\((?P<paren_num_num>\d+)\)\s*(?P<paren_num_rest>.*))
+      | (?P<roman_lower>\((?P<roman_lower_num>[ivxlcdm]+)\)\s*(?P<roman_lower_rest>.*))
+      | (?P<roman_upper>\((?P<roman_upper_num>[IVXLCDM]+)\)\s*(?P<roman_upper_rest>.*))
+    )$
+""", re.VERBOSE)
+
+# num_type -> (number group index, remaining-text group index)
+_SECTION_NUMBER_GROUPS = {
+    num_type: (_SECTION_NUMBER_RE.groupindex[f"{num_type}_num"],
+               _SECTION_NUMBER_RE.groupindex[f"{num_type}_rest"])
+    for num_type in ('article', 'section', 'subsub', 'sub', 'top',
+                     'letter_upper', 'letter_lower', 'paren_upper', 'paren_lower',
+                     'paren_num', 'roman_lower', 'roman_upper')
+}
+
+# Types whose captured number is wrapped back in parentheses
+_PAREN_NUM_TYPES = frozenset({'paren_upper', 'paren_lower', 'paren_num', 'roman_lower', 'roman_upper'})
+
+# Types recorded in the document's section list
+_SECTION_LIKE_TYPES = frozenset({'article', 'section', 'top'})
+
+# ASCII first characters of every section number form, plus the long s that
+# the case-insensitive SECTION match folds to "s"; other Unicode digits are
+# let through by isdecimal(), since \d matches them
+_SECTION_START_CHARS = frozenset(
+    '0123456789(ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz\u017f'
+)
+
+_CAPTION_TWO_SPACE_RE = re.compile(r'^([^.]+\.)\s{2,}')
+_FIRST_SENTENCE_RE = re.compile(r'^([^.]+\.)')
+_QUOTED_TERM_RE = re.compile(r'"([A-Z][^"]+)"')
+_PAREN_QUOTED_TERM_RE = re.compile(r'\((?:the\s+)?"([A-Z][^"]+)"\)')
+_EXHIBIT_RE = re.compile(r'^EXHIBIT\s+[A-Z0-9]', re.IGNORECASE)
+
+# Level inference for explicit section numbers without Word numbering
+_LEVEL_PATTERNS = [
+    (re.compile(r'^(Article|ARTICLE|Section|SECTION)'), 0),
+    (re.compile(r'^\d+\.\d+\.\d+'), 2),
+    (re.compile(r'^\d+\.\d+'), 1),
+    (re.compile(r'^\d+\.'), 0),
+    (re.compile(r'^\([ivxIVX]+\)'), 2),
+    (re.compile(r'^\([a-zA-Z]\)'), 2),
+]
+
+
 def extract_section_number(text):
     """Extract section number from paragraph text."""
     text = text.strip()
 
-    patterns = [
-        (r'^(ARTICLE\s+[IVXLCDM]+)[.\s:]+(.*)$', 'article'),
-        (r'^(Article\s+[IVXLCDM]+)[.\s:]+(.*)$', 'article'),
-        (r'^(ARTICLE\s+\d+)[.\s:]+(.*)$', 'article'),
-        (r'^(Article\s+\d+)[.\s:]+(.*)$', 'article'),
-        (r'^(Section\s+[\d]+\.[\d\.A-Za-z\(\)]+)[.\s:]+(.*)$', 'section'),
-        (r'^(Section\s+[\d]+)[.\s:]+(.*)$', 'section'),
-        (r'^(SECTION\s+[\d]+\.[\d\.A-Za-z\(\)]+)[.\s:]+(.*)$', 'section'),
-        (r'^(SECTION\s+[\d]+)[.\s:]+(.*)$', 'section'),
-        (r'^(\d+\.\d+\.\d+\.?\s*)(.*)$', 'subsub'),
-        (r'^(\d+\.\d+\.?\s*)(.*)$', 'sub'),
-        (r'^(\d+\.)\s+(.*)$', 'top'),
-        (r'^([A-Z]\.)\s+(.*)$', 'letter_upper'),
-        (r'^([a-z]\.)\s+(.*)$', 'letter_lower'),
-        (r'^\(([A-Z])\)\s*(.*)$', 'paren_upper'),
-        (r'^\(([a-z])\)\s*(.*)$', 'paren_lower'),
-        (r'^\((\d+)\)\s*(.*)$', 'paren_num'),
-        (r'^\(([ivxlcdm]+)\)\s*(.*)$', 'roman_lower'),
-        (r'^\(([IVXLCDM]+)\)\s*(.*)$', 'roman_upper'),
-    ]
-
-    for pattern, num_type in patterns:
-        match = re.match(pattern, text, re.IGNORECASE if num_type.startswith('article') or num_type.startswith('section') else 0)
-        if match:
-            section_num = match.group(1).strip()
-            remaining = match.group(2).strip() if match.lastindex >= 2 else ""
-            if num_type.startswith('paren') or num_type.startswith('roman'):
-                if not section_num.startswith('('):
-                    section_num = f"({section_num})"
-            return (section_num, remaining, num_type)
+    # Skip the regex when the first character cannot start a section number
+    if not text or (text[0] not in _SECTION_START_CHARS and not text[0].isdecimal()):
+        return (None, text, None)
+
+    match = _SECTION_NUMBER_RE.match(text)
+    if match:
+        num_type = match.lastgroup
+        num_group, rest_group = _SECTION_NUMBER_GROUPS[num_type]
+        section_num = match.group(num_group).strip()
+        remaining = match.group(rest_group).strip()
+        if num_type in _PAREN_NUM_TYPES:
+            section_num = f"({section_num})"
+        return (section_num, remaining, num_type)
 
     return (None, text, None)
 
@@ -90,13 +166,29 @@ def extract_section_number(text):
 def extract_caption(text, max_length=60):
     """Extract a caption from paragraph text."""
     section_num, remaining, _ = extract_section_number(text)
+    return _caption_from(text, remaining, max_length)
+
+
+def parse_paragraph_head(text, max_length=60):
+    """
+    Extract section number and caption from paragraph text in one pass.
+
+    Returns:
+        Tuple of (section_num, remaining, num_type, caption)
+    """
+    section_num, remaining, num_type = extract_section_number(text)
+    return (section_num, remaining, num_type, _caption_from(text, remaining, max_length))
+
+
+def _caption_from(text, remaining, max_length):
+    """Build a caption from the text following an already-extracted section number."""
     text_to_use = remaining if remaining else text
 
-    caption_match = re.match(r'^([^.]+\.)\s{2,}', text_to_use)
+    caption_match = _CAPTION_TWO_SPACE_RE.match(text_to_use)
     if caption_match:
         return caption_match.group(1).strip()
 
-    first_sentence = re.match(r'^([^.]+\.)', text_to_use)
+    first_sentence = _FIRST_SENTENCE_RE.match(text_to_use)
     if first_sentence and len(first_sentence.group(1)) <= max_length:
         return first_sentence.group(1).strip()
 
@@ -106,14 +198,39 @@ def extract_caption(text, max_length=60):
     return text_to_use.strip() if text_to_use.strip() else None
 
 
+_ROMAN_NUMERALS = (
+    (1000, 'M'), (900, 'CM'), (500, 'D'), (400, 'CD'), (100, 'C'), (90, 'XC'),
+    (50, 'L'), (40, 'XL'), (10, 'X'), (9, 'IX'), (5, 'V'), (4, 'IV'), (1, 'I'),
+)
+
+
+def _compute_roman(num):
+    """Convert integer to roman numeral."""
+    parts = []
+    for value, symbol in _ROMAN_NUMERALS:
+        if num >= value:
+            count, num = divmod(num, value)
+            parts.append(symbol * count)
+    return ''.join(parts)
+
+
+# Auto-numbered sub-subsections rarely run past a few dozen
+_ROMAN_CACHE = tuple(_compute_roman(n) for n in range(101))
+_ROMAN_LOWER_CACHE = tuple(roman.lower() for roman in _ROMAN_CACHE)
+
+
 class SectionTracker:
     """Tracks the current section hierarchy as we parse the document."""
 
+    __slots__ = ('hierarchy', 'counters', 'last_level', 'last_numId', '_snapshot')
+
     def __init__(self):
         self.hierarchy = []
         self.counters = {}
         self.last_level = -1
         self.last_numId = None
+        # Immutable view of hierarchy, rebuilt only when a section changes
+        self._snapshot = ()
 
     def update(self, numbering_level, section_num, caption, numId=None):
         """Update hierarchy based on new section encountered."""
@@ -134,30 +251,23 @@ class SectionTracker:
             if numbering_level is not None:
                 level = numbering_level
             else:
-                if re.match(r'^(Article|ARTICLE|Section|SECTION)', section_num):
-                    level = 0
-                elif re.match(r'^\d+\.\d+\.\d+', section_num):
-                    level = 2
-                elif re.match(r'^\d+\.\d+', section_num):
-                    level = 1
-                elif re.match(r'^\d+\.', section_num):
-                    level = 0
-                elif re.match(r'^\([ivx]+\)', section_num, re.IGNORECASE):
-                    level = 2
-                elif re.match(r'^\([a-z]\)', section_num, re.IGNORECASE):
-                    level = 2
+                for pattern, inferred_level in _LEVEL_PATTERNS:
+                    if pattern.match(section_num):
+                        level = inferred_level
+                        break
                 else:
                     level = self.last_level + 1 if self.last_level >= 0 else 0
         else:
             return
 
-        self.hierarchy = self.hierarchy[:level]
+        del self.hierarchy[level:]
         self.hierarchy.append({
             "level": level,
             "number": section_num,
             "caption": caption
         })
         self.last_level = level
+        self._snapshot = tuple(self.hierarchy)
 
     def _generate_section_number(self, level):
         """Generate section number string based on counters."""
@@ -169,7 +279,10 @@ class SectionTracker:
             return f"{letter}."
         elif level == 2:
             count = self.counters.get(2, 1)
-            roman = self._to_roman(count).lower()
+            if 0 <= count < len(_ROMAN_LOWER_CACHE):
+                roman = _ROMAN_LOWER_CACHE[count]
+            else:
+                roman = self._to_roman(count).lower()
             return f"({roman})"
         else:
             count = self.counters.get(level, 1)
@@ -177,18 +290,13 @@ class SectionTracker:
 
     def _to_roman(self, num):
         """Convert integer to roman numeral."""
-        val = [1000, 900, 500, 400, 100, 90, 50, 40, 10, 9, 5, 4, 1]
-        syms = ['M', 'CM', 'D', 'CD', 'C', 'XC', 'L', 'XL', 'X', 'IX', 'V', 'IV', 'I']
-        roman_num = ''
-        for i in range(len(val)):
-            while num >= val[i]:
-                num -= val[i]
-                roman_num += syms[i]
-        return roman_num
+        if 0 <= num < len(_ROMAN_CACHE):
+            return _ROMAN_CACHE[num]
+        return _compute_roman(num)
 
     def get_current_hierarchy(self):
-        """Return copy of current hierarchy."""
-        return list(self.hierarchy)
+        """Return the current hierarchy as a shared tuple snapshot (serializes like a list)."""
+        return self._snapshot
 
     def get_section_ref(self):
         """Return concise section reference for manifest."""
@@ -200,28 +308,31 @@ class SectionTracker:
 
 def extract_defined_terms(text):
     """Identify potential defined terms."""
-    quoted_terms = re.findall(r'"([A-Z][^"]+)"', text)
-    paren_terms = re.findall(r'\((?:the\s+)?"([A-Z][^"]+)"\)', text)
+    quoted_terms = _QUOTED_TERM_RE.findall(text)
+    paren_terms = _PAREN_QUOTED_TERM_RE.findall(text)
     return list(set(quoted_terms + paren_terms))
 
 
 def iter_block_items(document):
     """Iterate through document body items in order."""
     parent = document.element.body
-    for child in parent.iterchildren():
-        if child.tag == qn('w:p'):
+    # lxml filters by tag in C, skipping sectPr and other non-block children
+    for child in parent.iterchildren(_W_P, _W_TBL):
+        if child.tag == _W_P:
             yield Paragraph(child, document)
-        elif child.tag == qn('w:tbl'):
+        else:
             yield Table(child, document)
 
 
-def process_table(table, start_id, section_tracker):
+def process_table(table, start_id, section_tracker, style_names: Optional[Dict] = None):
     """Process a table and return structured data."""
+    # Tables never update the tracker, so one snapshot covers every cell
+    current_hierarchy = section_tracker.get_current_hierarchy()
     table_data = {
         "type": "table",
         "id": f"tbl_{start_id}",
         "rows": [],
-        "section_hierarchy": section_tracker.get_current_hierarchy()
+        "section_hierarchy": current_hierarchy
     }
 
     para_id = start_id
@@ -232,16 +343,15 @@ def process_table(table, start_id, section_tracker):
             for para in cell.paragraphs:
                 para_id += 1
                 text = para.text.strip()
-                section_num, remaining, num_type = extract_section_number(text)
-                caption = extract_caption(text)
+                section_num, remaining, num_type, caption = parse_paragraph_head(text)
 
                 cell_paragraphs.append({
                     "id": f"p_{para_id}",
                     "text": text,
                     "section_number": section_num,
                     "caption": caption,
-                    "style_info": get_paragraph_style_info(para),
-                    "section_hierarchy": section_tracker.get_current_hierarchy()
+                    "style_info": get_paragraph_style_info(para, style_names),
+                    "section_hierarchy": current_hierarchy
                 })
             row_data.append({
                 "cell_id": f"cell_{row_idx}_{cell_idx}",
@@ -252,6 +362,30 @@ def process_table(table, start_id, section_tracker):
     return table_data, para_id
 
 
+def build_paragraph_lookup(content: List[Dict]) -> Dict[str, Dict]:
+    """
+    Index parsed paragraphs by id, including paragraphs nested in table cells.
+
+    Args:
+        content: The "content" list from parse_document
+
+    Returns:
+        Dict mapping para_id to paragraph dict
+    """
+    lookup = {}
+    put = lookup.__setitem__
+    for item in content:
+        item_type = item.get("type")
+        if item_type == "paragraph":
+            put(item["id"], item)
+        elif item_type == "table":
+            for row in item["rows"]:
+                for cell in row:
+                    for para in cell["paragraphs"]:
+                        put(para["id"], para)
+    return lookup
+
+
 def parse_document(docx_path) -> Dict[str, Any]:
     """
     Parse a .docx file and extract structured content with section tracking.
@@ -283,15 +417,16 @@ def parse_document(docx_path) -> Dict[str, Any]:
 
     para_id = 0
     all_defined_terms = set()
+    # Style ID -> name; documents use only a handful of styles
+    style_names = {}
 
     for block in iter_block_items(doc):
         if isinstance(block, Paragraph):
             para_id += 1
             para_text = block.text.strip()
-            style_info = get_paragraph_style_info(block)
+            style_info = get_paragraph_style_info(block, style_names)
 
-            section_num, remaining, num_type = extract_section_number(para_text)
-            caption = extract_caption(para_text)
+            section_num, remaining, num_type, caption = parse_paragraph_head(para_text)
 
             numbering_level = style_info["numbering"]["level"] if style_info["numbering"] else None
             numId = style_info["numbering"]["numId"] if style_info["numbering"] else None
@@ -310,7 +445,7 @@ def parse_document(docx_path) -> Dict[str, Any]:
                 "section_hierarchy": section_tracker.get_current_hierarchy()
             }
 
-            if style_info["is_heading"] or (section_num and num_type in ['article', 'section', 'top']):
+            if style_info["is_heading"] or (section_num and num_type in _SECTION_LIKE_TYPES):
                 result["sections"].append({
                     "id": f"sec_{para_id}",
                     "number": section_num,
@@ -319,7 +454,7 @@ def parse_document(docx_path) -> Dict[str, Any]:
                     "hierarchy": section_tracker.get_current_hierarchy()
                 })
 
-            if re.match(r'^EXHIBIT\s+[A-Z0-9]', para_text, re.IGNORECASE):
+            if _EXHIBIT_RE.match(para_text):
                 result["exhibits"].append({
                     "id": f"ex_{para_id}",
                     "title": para_text,
@@ -332,7 +467,7 @@ def parse_document(docx_path) -> Dict[str, Any]:
             result["content"].append(para_data)
 
         elif isinstance(block, Table):
-            table_data, para_id = process_table(block, para_id, section_tracker)
+            table_data, para_id = process_table(block, para_id, section_tracker, style_names)
             result["content"].append(table_data)
 
     result["defined_terms"] = sorted(list(all_defined_terms))
@@ -342,11 +477,13 @@ def parse_document(docx_path) -> Dict[str, Any]:
 
 def replace_paragraph_text(paragraph, new_text):
     """Replace paragraph text while preserving formatting."""
-    if not paragraph.runs:
+    # Paragraph.runs rebuilds its Run proxies on every access
+    runs = paragraph.runs
+    if not runs:
         paragraph.text = new_text
         return
 
-    first_run = paragraph.runs[0]
+    first_run = runs[0]
     first_run_format = {
         'bold': first_run.bold,
         'italic': first_run.italic,
@@ -355,7 +492,7 @@ def replace_paragraph_text(paragraph, new_text):
         'font_size': first_run.font.size,
     }
 
-    for run in paragraph.runs:
+    for run in runs:
         run.text = ""
 
     first_run.text = new_text
@@ -381,29 +518,30 @@ def rebuild_document(original_path, revisions: Dict[str, Dict], output_path) ->
     Returns:
         Number of changes made
     """
-    # Build lookup of revised content
-    revised_lookup = {}
-    for para_id, revision in revisions.items():
-        if revision.get('accepted', False):
-            revised_lookup[para_id] = revision.get('revised', '')
-
-    # Copy original document
-    shutil.copy2(original_path, output_path)
+    # Build lookup of revised content, dropping revisions that leave the
+    # recorded original unchanged so their paragraphs are never re-read
+    revised_lookup = {
+        para_id: revision.get('revised', '')
+        for para_id, revision in revisions.items()
+        if revision.get('accepted', False)
+        and revision.get('revised', '') != revision.get('original', '').strip()
+    }
 
-    # Open the copy and apply changes
-    doc = Document(str(output_path))
+    # Load the original into memory; saving to output_path below writes the
+    # result without copying the source file first
+    doc = Document(str(original_path))
 
     para_id = 0
     changes_made = 0
+    get_revised = revised_lookup.get
 
     for block in iter_block_items(doc):
         if isinstance(block, Paragraph):
             para_id += 1
-            para_key = f"p_{para_id}"
+            revised_text = get_revised(f"p_{para_id}")
 
-            if para_key in revised_lookup:
+            if revised_text is not None:
                 original_text = block.text.strip()
-                revised_text = revised_lookup[para_key]
 
                 if original_text != revised_text:
                     replace_paragraph_text(block, revised_text)
@@ -414,11 +552,10 @@ def rebuild_document(original_path, revisions: Dict[str, Dict], output_path) ->
                 for cell in row.cells:
                     for para in cell.paragraphs:
                         para_id += 1
-                        para_key = f"p_{para_id}"
+                        revised_text = get_revised(f"p_{para_id}")
 
-                        if para_key in revised_lookup:
+                        if revised_text is not None:
                             original_text = para.text.strip()
-                            revised_text = revised_lookup[para_key]
 
                             if original_text != revised_text:
                                 replace_paragraph_text(para, revised_text)
@@ -479,102 +616,113 @@ def generate_inline_diff_html(original: str, revised: str) -> str:
         return f'<del class="diff-del">{original}</del><ins class="diff-ins">{revised}</ins>'
 
 
+# Write buffer for streamed output files (larger than io.DEFAULT_BUFFER_SIZE)
+OUTPUT_BUFFER_SIZE = 128 * 1024
+
+
+# One manifest change block, emitted with a single write per revision
+_MANIFEST_CHANGE_TEMPLATE = (
+    "\n### {para_id}\n\n"
+    "**Original:**\n> {original}...\n\n"
+    "**Revised:**\n> {revised}...\n\n"
+    "**Rationale:** {rationale}\n\n"
+    "---\n"
+)
+
+
+def _para_index(para_id: str) -> int:
+    """Numeric position of a "p_N" paragraph id (non-numeric ids sort last)."""
+    num = para_id.partition('_')[2]
+    return int(num) if num.isdigit() else sys.maxsize
+
+
+def _write_manifest(w, revisions: Dict[str, Dict], representation: str, deal_context: str) -> int:
+    """
+    Emit the markdown manifest through a write callable.
+
+    Returns:
+        Number of accepted revisions written
+    """
+    # Decorate each id with its paragraph number once so p_2 sorts before p_10
+    keyed = [(_para_index(para_id), para_id, revision)
+             for para_id, revision in revisions.items() if revision.get('accepted')]
+    keyed.sort(key=lambda k: (k[0], k[1]))
+    accepted = [(para_id, revision) for _, para_id, revision in keyed]
+
+    w("# Redline Manifest\n\n")
+    w(f"**Generated:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
+    w(f"**Representation:** {representation}\n\n")
+    if deal_context:
+        w(f"**Deal Context:** {deal_context}")
+    w("\n\n---\n\n## Summary\n\n")
+    w(f"Total revisions: {len(accepted)}\n\n---\n\n## Changes\n")
+
+    template = _MANIFEST_CHANGE_TEMPLATE
+    for para_id, revision in accepted:
+        w(template.format(
+            para_id=para_id,
+            original=revision.get('original', '')[:200],
+            revised=revision.get('revised', '')[:200],
+            rationale=revision.get('rationale', 'N/A')
+        ))
+
+    return len(accepted)
+
+
 def generate_manifest(revisions: Dict[str, Dict], representation: str, deal_context: str) -> str:
     """Generate markdown manifest of all changes."""
-    lines = [
-        "# Redline Manifest",
-        "",
-        f"**Generated:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}",
-        f"**Representation:** {representation}",
-        "",
-        f"**Deal Context:** {deal_context}" if deal_context else "",
-        "",
-        "---",
-        "",
-        f"## Summary",
-        "",
-        f"Total revisions: {len([r for r in revisions.values() if r.get('accepted')])}",
-        "",
-        "---",
-        "",
-        "## Changes",
-        ""
-    ]
-
-    for para_id, revision in sorted(revisions.items()):
-        if not revision.get('accepted'):
-            continue
-
-        lines.extend([
-            f"### {para_id}",
-            "",
-            f"**Original:**",
-            f"> {revision.get('original', '')[:200]}...",
-            "",
-            f"**Revised:**",
-            f"> {revision.get('revised', '')[:200]}...",
-            "",
-            f"**Rationale:** {revision.get('rationale', 'N/A')}",
-            "",
-            "---",
-            ""
-        ])
-
-    return "\n".join(lines)
+    # Write into a single buffer rather than collecting lines for a final join
+    buf = io.StringIO()
+    _write_manifest(buf.write, revisions, representation, deal_context)
+    return buf.getvalue()
+
+
+def write_manifest(output_path, revisions: Dict[str, Dict], representation: str,
+                   deal_context: str) -> int:
+    """
+    Stream the markdown manifest straight to a file.
+
+    Returns:
+        Number of accepted revisions written
+    """
+    with open(output_path, 'w', encoding='utf-8', buffering=OUTPUT_BUFFER_SIZE) as f:
+        return _write_manifest(f.write, revisions, representation, deal_context)
 
 
 def generate_transmittal(revisions: Dict, flags: List, representation: str, deal_context: str) -> str:
     """Generate transmittal email text."""
-    accepted_count = len([r for r in revisions.values() if r.get('accepted')])
-
-    lines = [
-        "DRAFT TRANSMITTAL EMAIL",
-        "=" * 50,
-        "",
-        "Subject: Redlined Contract - [INSERT DEAL NAME]",
-        "",
-        "Dear [Client],",
-        "",
-        f"Please find attached our redlined version of the [Contract Type]. As {representation}'s counsel, "
-        f"we have made {accepted_count} revisions to protect your interests.",
-        "",
-        "KEY CHANGES:",
-        ""
-    ]
-
-    # Group revisions by type/category if available
-    change_types = {}
-    for para_id, rev in revisions.items():
-        if rev.get('accepted'):
-            rationale = rev.get('rationale', 'General revision')
-            if rationale not in change_types:
-                change_types[rationale] = 0
-            change_types[rationale] += 1
-
-    for rationale, count in sorted(change_types.items(), key=lambda x: -x[1])[:5]:
-        lines.append(f"- {rationale} ({count} instances)")
-
-    lines.extend([
-        "",
-        "ITEMS FLAGGED FOR YOUR REVIEW:",
-        ""
-    ])
+    # Count accepted revisions and group them by rationale in one pass
+    change_types = Counter(
+        rev.get('rationale', 'General revision')
+        for rev in revisions.values() if rev.get('accepted')
+    )
+    accepted_count = sum(change_types.values())
+
+    buf = io.StringIO()
+    w = buf.write
+
+    w("DRAFT TRANSMITTAL EMAIL\n")
+    w("=" * 50)
+    w("\n\nSubject: Redlined Contract - [INSERT DEAL NAME]\n\nDear [Client],\n\n")
+    w(f"Please find attached our redlined version of the [Contract Type]. As {representation}'s counsel, "
+      f"we have made {accepted_count} revisions to protect your interests.\n\n")
+    w("KEY CHANGES:\n")
+
+    for rationale, count in change_types.most_common(5):
+        w(f"\n- {rationale} ({count} instances)")
+
+    w("\n\nITEMS FLAGGED FOR YOUR REVIEW:\n")
 
     if flags:
         for flag in flags:
-            lines.append(f"- Section {flag.get('section_ref', 'N/A')}: {flag.get('note', 'Please review')}")
+            w(f"\n- Section {flag.get('section_ref', 'N/A')}: {flag.get('note', 'Please review')}")
     else:
-        lines.append("- No items specifically flagged.")
+        w("\n- No items specifically flagged.")
 
-    lines.extend([
-        "",
-        "Please let us know if you have any questions or would like to discuss any of these changes.",
-        "",
-        "Best regards,",
-        "[Attorney Name]"
-    ])
+    w("\n\nPlease let us know if you have any questions or would like to discuss any of these changes.\n\n")
+    w("Best regards,\n[Attorney Name]")
 
-    return "\n".join(lines)
+    return buf.getvalue()
 
 
 def generate_final_output(session_id: str, original_path: str, parsed_doc: Dict,
@@ -594,9 +742,7 @@ def generate_final_output(session_id: str, original_path: str, parsed_doc: Dict,
 
     # Generate manifest
     manifest_path = output_dir / 'manifest.md'
-    manifest_content = generate_manifest(revisions, representation, deal_context)
-    with open(manifest_path, 'w', encoding='utf-8') as f:
-        f.write(manifest_content)
+    accepted_count = write_manifest(manifest_path, revisions, representation, deal_context)
 
     # Generate transmittal
     transmittal_path = output_dir / 'transmittal.txt'
@@ -609,11 +755,16 @@ def generate_final_output(session_id: str, original_path: str, parsed_doc: Dict,
         'manifest_path': str(manifest_path),
         'transmittal_path': str(transmittal_path),
         'changes_made': changes_made,
-        'accepted_revisions': len([r for r in revisions.values() if r.get('accepted')]),
+        'accepted_revisions': accepted_count,
         'flags_count': len(flags)
     }
 
 
+def _truncate(text: str, limit: int) -> str:
+    """Cut text to limit characters, adding an ellipsis only if it was longer."""
+    return text[:limit] + '...' if len(text) > limit else text
+
+
 def generate_final_documents(session_id: str, original_path: str, parsed_doc: Dict,
                              revisions: Dict, author_name: str = "Contract Review Tool") -> Dict[str, Any]:
     """
@@ -643,23 +794,23 @@ def generate_final_documents(session_id: str, original_path: str, parsed_doc: Di
     # Build lookup of accepted revisions
     accepted_revisions = {}
     revision_details = []
+    content_by_id = build_paragraph_lookup(parsed_doc.get('content', []))
 
     for para_id, revision in revisions.items():
         if revision.get('accepted', False):
             accepted_revisions[para_id] = revision
             # Find section reference from parsed_doc
             section_ref = None
-            para_text_preview = revision.get('original', '')[:100]
-            for item in parsed_doc.get('content', []):
-                if item.get('id') == para_id:
-                    section_ref = item.get('section_ref', '')
-                    para_text_preview = item.get('text', '')[:100]
-                    break
+            preview_text = revision.get('original', '')
+            item = content_by_id.get(para_id)
+            if item is not None:
+                section_ref = item.get('section_ref', '')
+                preview_text = item.get('text', '')
 
             revision_details.append({
                 'para_id': para_id,
                 'section_ref': section_ref or para_id,
-                'original_preview': para_text_preview + ('...' if len(revision.get('original', '')) > 100 else ''),
+                'original_preview': _truncate(preview_text, 100),
                 'rationale': revision.get('rationale', 'No rationale provided')
             })
 
@@ -701,13 +852,8 @@ def _generate_track_changes_with_redlines(original_path: str, accepted_revisions
 
     This creates proper Word track changes that display correctly in Microsoft Word.
     """
-    from redlines import Redlines
-
-    # Copy original document first
-    shutil.copy2(original_path, output_path)
-
-    # Open the document
-    doc = Document(str(output_path))
+    # Open the original; changes are saved straight to output_path
+    doc = Document(str(original_path))
 
     # Track paragraph index
     para_id = 0
@@ -723,11 +869,6 @@ def _generate_track_changes_with_redlines(original_path: str, accepted_revisions
                 revised_text = revision.get('revised', '')
 
                 if original_text != revised_text:
-                    # Use redlines to generate the diff
-                    redline = Redlines(original_text, revised_text)
-
-                    # Get the redline output as markdown-style text
-                    # We need to apply this as Word track changes
                     _apply_track_changes_to_paragraph(block, original_text, revised_text, author_name)
 
         elif isinstance(block, Table):
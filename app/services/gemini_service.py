@@ -6,15 +6,16 @@ Integrates with Google Gemini API to generate surgical redlines.
 Adapted from semantic_redline_engine.py with chain-of-thought prompting.
 """
 
-import os
+import io
 import re
 import math
 import json
 import time
 import random
-from pathlib import Path
 from typing import Dict, List, Any, Optional
-from collections import Counter
+from collections import Counter, defaultdict
+from app.services.api_keys import get_gemini_api_key as get_api_key
+from app.services.source_cache import SourceCache
 
 # Load environment variables
 try:
@@ -31,33 +32,6 @@ try:
 except ImportError:
     HAS_GEMINI = False
 
-# API Key loading
-def get_api_key() -> Optional[str]:
-    """Get Gemini API key from various sources."""
-    # Try environment variables
-    key = os.getenv("GEMINI_API_KEY") or os.getenv("GOOGLE_API_KEY")
-    if key:
-        return key
-
-    # Try api.txt file in project root
-    api_txt_paths = [
-        Path(__file__).parent.parent.parent / 'api.txt',
-        Path(__file__).parent.parent.parent / '.env',
-        Path.home() / '.gemini_api_key'
-    ]
-
-    for path in api_txt_paths:
-        if path.exists():
-            content = path.read_text().strip()
-            if path.suffix == '.txt':
-                return content
-            # Parse .env format
-            for line in content.split('\n'):
-                if line.startswith('GEMINI_API_KEY=') or line.startswith('GOOGLE_API_KEY='):
-                    return line.split('=', 1)[1].strip().strip('"\'')
-
-    return None
-
 
 class SimpleRetriever:
     """Finds relevant clauses in precedent form based on topic and text similarity."""
@@ -90,6 +64,13 @@ class SimpleRetriever:
         self.num_docs = len(self.documents)
         self._calc_norms()
 
+        # Inverted index: token -> [(document index, count)], so a search only
+        # visits documents sharing at least one token with the query
+        self.postings = defaultdict(list)
+        for idx, doc in enumerate(self.documents):
+            for token, count in doc['tokens'].items():
+                self.postings[token].append((idx, count))
+
     def _tokenize(self, text: str) -> List[str]:
         text = text.lower()
         text = re.sub(r'[^a-z0-9\s]', '', text)
@@ -125,17 +106,22 @@ class SimpleRetriever:
         if q_norm == 0:
             return []
 
-        scores = []
-        for doc in self.documents:
-            dot_product = 0
-            for token, count in q_vec.items():
-                if token in doc['tokens']:
-                    q_score = count * self._get_idf(token)
-                    d_score = doc['tokens'][token] * self._get_idf(token)
-                    dot_product += q_score * d_score
+        # Accumulate dot products per document from the query's postings
+        dot_products = {}
+        for token, count in q_vec.items():
+            postings = self.postings.get(token)
+            if not postings:
+                continue
+            idf = self._get_idf(token)
+            q_score = count * idf
+            for idx, doc_count in postings:
+                dot_products[idx] = dot_products.get(idx, 0) + q_score * (doc_count * idf)
 
+        scores = []
+        for idx in sorted(dot_products):
+            doc = self.documents[idx]
             if doc['norm'] > 0:
-                similarity = dot_product / (q_norm * doc['norm'])
+                similarity = dot_products[idx] / (q_norm * doc['norm'])
             else:
                 similarity = 0
 
@@ -146,6 +132,16 @@ class SimpleRetriever:
         return [s[1] for s in scores[:top_k]]
 
 
+# Retrievers keyed by precedent content, so revisions against the same
+# precedent reuse one tokenized index instead of rebuilding it per clause
+_RETRIEVER_CACHE = SourceCache()
+
+
+def get_retriever(precedent_content: List[Dict]) -> SimpleRetriever:
+    """Return a SimpleRetriever over the precedent paragraphs, reusing a cached index."""
+    return _RETRIEVER_CACHE.get_or_build(precedent_content, lambda: SimpleRetriever(precedent_content))
+
+
 def build_system_prompt(representation: str, aggressiveness: int) -> str:
     """Build system prompt for the redlining model."""
     return f"""You are an expert real estate attorney redlining a contract to protect your client's interests.
@@ -217,63 +213,65 @@ def build_revision_prompt(
     """
     from app.models import ConceptMap, RiskMap
 
-    prompt_parts = []
+    # Sections are written in order into one buffer
+    out = io.StringIO()
+    w = out.write
 
     # Document Context - Concept Map
     if concept_map:
         cm = ConceptMap.from_dict(concept_map)
         concept_text = cm.to_prompt_format()
         if concept_text.strip():
-            prompt_parts.append("## Document Context\n")
-            prompt_parts.append(concept_text)
-            prompt_parts.append("\n")
+            w("## Document Context\n")
+            w(concept_text)
+            w("\n")
 
     # Risk Context - Matrix showing relationships
     if risk_map and risks:
         rm = RiskMap.from_dict(risk_map)
         risk_ids = [r.get('risk_id') for r in risks if r.get('risk_id')]
         if risk_ids:
-            prompt_parts.append("## Risk Context\n")
-            prompt_parts.append(rm.to_matrix_format(risk_ids))
-            prompt_parts.append("\n\n")
+            w("## Risk Context\n")
+            w(rm.to_matrix_format(risk_ids))
+            w("\n\n")
 
     hierarchy_str = " > ".join([
         f"{h.get('number', '')} {h.get('caption', '')}"
         for h in section_hierarchy
     ]) if section_hierarchy else "Unknown Section"
 
-    risks_str = ""
-    if risks:
-        risks_str = "\n\nIDENTIFIED RISKS:\n"
-        for risk in risks:
-            risk_type = risk.get('type') or risk.get('title', 'unknown')
-            risks_str += f"- {risk_type}: {risk.get('description', '')}\n"
+    w(f"""TARGET SECTION: {section_ref}
+HIERARCHY: {hierarchy_str}
 
-    precedent_str = ""
-    if precedent_clause:
-        precedent_str = f"\n\nPREFERRED PRECEDENT:\n\"{precedent_clause}\"\n"
+TARGET CLAUSE:
+"{original_text}"
+""")
 
-    context_str = ""
-    if deal_context:
-        context_str = f"\n\nDEAL CONTEXT:\n{deal_context}\n"
+    if precedent_clause:
+        w(f"\n\nPREFERRED PRECEDENT:\n\"{precedent_clause}\"\n")
 
-    custom_str = ""
-    if custom_instruction:
-        custom_str = f"\n\nSPECIFIC INSTRUCTION:\n{custom_instruction}\n"
+    if risks:
+        w("\n\nIDENTIFIED RISKS:\n")
+        for risk in risks:
+            risk_type = risk.get('type') or risk.get('title', 'unknown')
+            w(f"- {risk_type}: {risk.get('description', '')}\n")
 
-    # Build related clauses context
-    related_str = ""
-    related_ids_for_revision = []
+    # Related clauses context
     if related_clauses:
-        related_str = "\n\nRELATED CLAUSES (consider for consistency and harmonization):\n"
+        w("\n\nRELATED CLAUSES (consider for consistency and harmonization):\n")
         for i, rel in enumerate(related_clauses):
             rel_id = rel.get('id', f'related_{i}')
-            related_ids_for_revision.append(rel_id)
-            related_str += f"\n--- [{rel_id}] {rel.get('section_ref', '')} ---\n"
-            related_str += f"FULL TEXT: {rel.get('text', '')}\n"
+            w(f"\n--- [{rel_id}] {rel.get('section_ref', '')} ---\n")
+            w(f"FULL TEXT: {rel.get('text', '')}\n")
             if rel.get('revised_text'):
-                related_str += f"(Already revised to: {rel.get('revised_text', '')})\n"
-        related_str += "\nIMPORTANT: For each related clause that needs changes for consistency, include it in the 'related_revisions' array in your response.\n"
+                w(f"(Already revised to: {rel.get('revised_text', '')})\n")
+        w("\nIMPORTANT: For each related clause that needs changes for consistency, include it in the 'related_revisions' array in your response.\n")
+
+    if deal_context:
+        w(f"\n\nDEAL CONTEXT:\n{deal_context}\n")
+
+    if custom_instruction:
+        w(f"\n\nSPECIFIC INSTRUCTION:\n{custom_instruction}\n")
 
     related_revision_instruction = ""
     if related_clauses:
@@ -294,13 +292,7 @@ Consider the Document Context above:
 
 """
 
-    # Combine all parts
-    prompt_parts.append(f"""TARGET SECTION: {section_ref}
-HIERARCHY: {hierarchy_str}
-
-TARGET CLAUSE:
-"{original_text}"
-{precedent_str}{risks_str}{related_str}{context_str}{custom_str}
+    w(f"""
 
 TASK: Revise the TARGET CLAUSE to protect the client's interests. Apply surgical edits that maintain the original sentence structure while addressing the identified risks.
 {context_instructions}
@@ -336,7 +328,7 @@ If you identify that other clauses in the document should also be revised for co
 Priority should be "recommended" (should do) or "optional" (nice to have).
 """)
 
-    return "".join(prompt_parts)
+    return out.getvalue()
 
 
 def extract_revision_from_response(response_text: str, original_text: str) -> Dict[str, Any]:
@@ -444,7 +436,7 @@ def generate_revision(
     # Find relevant precedent clause if available
     precedent_clause = None
     if precedent_doc and precedent_doc.get('content'):
-        retriever = SimpleRetriever(precedent_doc['content'])
+        retriever = get_retriever(precedent_doc['content'])
         matches = retriever.search(original_text, top_k=1)
         if matches:
             precedent_clause = matches[0]['text']
@@ -32,6 +32,24 @@ def inject_paragraph_ids(html: str, paragraph_ids: List[str]) -> str:
     return re.sub(r'<p(?=[\s>])', replace_p, html)
 
 
+def _inner_html(html: str, tag: str) -> Optional[str]:
+    """
+    Return the content between the first <tag ...> and the next </tag>.
+
+    Linear str.find scan equivalent to re.search(r'<tag[^>]*>(.*?)</tag>', html, re.DOTALL).
+    """
+    open_at = html.find(f'<{tag}')
+    if open_at == -1:
+        return None
+    content_start = html.find('>', open_at) + 1
+    if content_start == 0:
+        return None
+    close_at = html.find(f'</{tag}>', content_start)
+    if close_at == -1:
+        return None
+    return html[content_start:close_at]
+
+
 def add_preview_wrapper(html: str) -> str:
     """
     Wrap the HTML body content for embedding in the app.
@@ -39,18 +57,16 @@ def add_preview_wrapper(html: str) -> str:
     Extracts just the <main> content and adds our preview class.
     """
     # Extract content between <main> tags if present
-    main_match = re.search(r'<main[^>]*>(.*?)</main>', html, re.DOTALL)
-    if main_match:
-        content = main_match.group(1)
-    else:
+    content = _inner_html(html, 'main')
+    if content is None:
         # Extract body content
-        body_match = re.search(r'<body[^>]*>(.*?)</body>', html, re.DOTALL)
-        content = body_match.group(1) if body_match else html
+        content = _inner_html(html, 'body')
+        if content is None:
+            content = html
 
     # Extract styles from head and scope them to avoid leaking into the host page.
     # The library emits bare `body { ... }` rules that would affect the real <body>.
-    style_match = re.search(r'<style[^>]*>(.*?)</style>', html, re.DOTALL)
-    styles = style_match.group(1) if style_match else ''
+    styles = _inner_html(html, 'style') or ''
     # Replace bare `body` selectors with `.document-preview` so they stay scoped
     styles = re.sub(r'\bbody\b', '.document-preview', styles)
 
@@ -108,14 +124,15 @@ def render_document_html(docx_path: str, paragraph_ids: Optional[List[str]] = No
     # Wrap for preview display
     html = add_preview_wrapper(raw_html)
 
+    # Cache the result (without IDs - they get injected on read); the
+    # wrapped page is written as one encoded payload rather than rebuilt
+    if use_cache:
+        cache_path.write_bytes(html.encode('utf-8'))
+
     # Inject paragraph IDs if provided
     if paragraph_ids:
         html = inject_paragraph_ids(html, paragraph_ids)
 
-    # Cache the result (without IDs - they get injected on read)
-    if use_cache:
-        cache_path.write_text(add_preview_wrapper(raw_html), encoding='utf-8')
-
     return html
 
 
@@ -142,14 +159,14 @@ def render_precedent_html(docx_path: str, paragraph_ids: Optional[List[str]] = N
     # Wrap for preview display
     html = add_preview_wrapper(raw_html)
 
+    # Cache the result (without IDs)
+    if use_cache:
+        cache_path.write_bytes(html.encode('utf-8'))
+
     # Inject paragraph IDs if provided
     if paragraph_ids:
         html = inject_paragraph_ids(html, paragraph_ids)
 
-    # Cache the result
-    if use_cache:
-        cache_path.write_text(add_preview_wrapper(raw_html), encoding='utf-8')
-
     return html
 
 
@@ -16,11 +16,10 @@ Part of Phase 6: Analysis Acceleration
 
 import asyncio
 import json
-import os
 import re
 import random
-from pathlib import Path
 from typing import List, Dict, Any, Optional, Callable
+from app.services.api_keys import get_gemini_api_key
 
 # Try to import Gemini SDK
 try:
@@ -54,33 +53,6 @@ def normalize_contract_type(contract_type: str) -> str:
     return CONTRACT_TYPE_NAMES.get(contract_type.lower(), contract_type)
 
 
-def get_gemini_api_key() -> Optional[str]:
-    """Get Gemini API key from various sources."""
-    # Try environment variables
-    key = os.getenv("GEMINI_API_KEY") or os.getenv("GOOGLE_API_KEY")
-    if key:
-        return key
-
-    # Try api.txt file in project root
-    api_txt_paths = [
-        Path(__file__).parent.parent.parent / 'api.txt',
-        Path(__file__).parent.parent.parent / '.env',
-        Path.home() / '.gemini_api_key'
-    ]
-
-    for path in api_txt_paths:
-        if path.exists():
-            content = path.read_text().strip()
-            if path.suffix == '.txt':
-                return content
-            # Parse .env format
-            for line in content.split('\n'):
-                if line.startswith('GEMINI_API_KEY=') or line.startswith('GOOGLE_API_KEY='):
-                    return line.split('=', 1)[1].strip().strip('"\'')
-
-    return None
-
-
 # Risk categories by contract type
 RISK_CATEGORIES = {
     "Purchase and Sale Agreement": [
@@ -117,6 +117,17 @@ def detect_concept_changes(original: str, revised: str) -> List[Dict[str, Any]]:
     return changes
 
 
+# Map concept types to categories
+_TYPE_TO_CATEGORY = {
+    'basket': 'liability_limitations',
+    'cap': 'liability_limitations',
+    'survival': 'liability_limitations',
+    'cure_period': 'default_remedies',
+    'termination': 'termination_triggers',
+    'knowledge': 'knowledge_standards'
+}
+
+
 def update_maps_on_revision(
     concept_map_dict: Dict[str, Any],
     risk_map_dict: Dict[str, Any],
@@ -141,20 +152,14 @@ def update_maps_on_revision(
     cm = ConceptMap.from_dict(concept_map_dict)
     rm = RiskMap.from_dict(risk_map_dict)
     affected_para_ids = []
-
-    # Map concept types to categories
-    type_to_category = {
-        'basket': 'liability_limitations',
-        'cap': 'liability_limitations',
-        'survival': 'liability_limitations',
-        'cure_period': 'default_remedies',
-        'termination': 'termination_triggers',
-        'knowledge': 'knowledge_standards'
-    }
+    seen_para_ids = set()
+    # Provision ref -> affected risks, built once rather than rescanning
+    # every risk for each change
+    affected_by_ref = rm.get_affected_risks_index() if changes else {}
 
     for change in changes:
         concept_type = change['type']
-        category = type_to_category.get(concept_type, 'other')
+        category = _TYPE_TO_CATEGORY.get(concept_type, 'other')
 
         if change['action'] == 'added':
             cm.add_provision(
@@ -177,9 +182,9 @@ def update_maps_on_revision(
 
         # Find risks affected by this provision change
         provision_ref = f"{section_ref}:{concept_type}"
-        affected_risks = rm.get_affected_risks(provision_ref)
-        for risk in affected_risks:
-            if risk.para_id not in affected_para_ids:
+        for risk in affected_by_ref.get(provision_ref, ()):
+            if risk.para_id not in seen_para_ids:
+                seen_para_ids.add(risk.para_id)
                 affected_para_ids.append(risk.para_id)
 
     # Recalculate risk severities after changes
@@ -10,6 +10,7 @@ conceptually similar clauses with different wording.
 
 import re
 from typing import List, Dict, Any, Optional, Tuple
+from app.services.source_cache import SourceCache
 
 try:
     from sklearn.feature_extraction.text import TfidfVectorizer
@@ -220,6 +221,44 @@ class ClauseMatcher:
         return matches[:self.max_results]
 
 
+# Fitted matchers keyed by precedent content, so repeated paragraph lookups
+# against the same precedent reuse one TF-IDF fit
+_MATCHER_CACHE = SourceCache()
+
+
+def get_fitted_matcher(
+    precedent_content: List[Dict[str, Any]],
+    min_score: float = 0.1,
+    max_results: int = 10
+) -> Optional[ClauseMatcher]:
+    """
+    Return a ClauseMatcher fitted on the precedent paragraphs, reusing a cached fit.
+
+    Args:
+        precedent_content: List of paragraphs from precedent document
+        min_score: Minimum similarity score (0-1)
+        max_results: Maximum matches to return
+
+    Returns:
+        Fitted ClauseMatcher, or None if there are no precedent paragraphs
+    """
+    def fit() -> Optional[ClauseMatcher]:
+        # Filter to paragraphs only
+        precedent_paragraphs = [
+            item for item in precedent_content
+            if item.get('type') == 'paragraph' and item.get('text', '').strip()
+        ]
+
+        if not precedent_paragraphs:
+            return None
+
+        matcher = ClauseMatcher(min_score=min_score, max_results=max_results)
+        matcher.fit(precedent_paragraphs)
+        return matcher
+
+    return _MATCHER_CACHE.get_or_build(precedent_content, fit, min_score, max_results)
+
+
 def find_related_clauses(
     target_clause: Dict[str, Any],
     precedent_content: List[Dict[str, Any]],
@@ -242,19 +281,11 @@ def find_related_clauses(
         # Fallback to empty results if sklearn not available
         return []
 
-    # Filter to paragraphs only
-    precedent_paragraphs = [
-        item for item in precedent_content
-        if item.get('type') == 'paragraph' and item.get('text', '').strip()
-    ]
-
-    if not precedent_paragraphs:
+    # Reuse the fitted matcher for this precedent and find matches
+    matcher = get_fitted_matcher(precedent_content, min_score, max_results)
+    if matcher is None:
         return []
 
-    # Create matcher and find matches
-    matcher = ClauseMatcher(min_score=min_score, max_results=max_results)
-    matcher.fit(precedent_paragraphs)
-
     return matcher.find_matches(target_clause)
 
 
@@ -24,6 +24,8 @@ import os
 import re
 import time
 import random
+from collections import defaultdict
+from itertools import islice
 from pathlib import Path
 from typing import List, Dict, Any, Optional, Callable, Set
 
@@ -42,6 +44,13 @@ try:
 except ImportError:
     HAS_GEMINI = False
 
+# Try to import Aho-Corasick for single-pass defined term matching
+try:
+    import ahocorasick
+    HAS_AHOCORASICK = True
+except ImportError:
+    HAS_AHOCORASICK = False
+
 # Load environment variables
 try:
     from dotenv import load_dotenv
@@ -52,6 +61,13 @@ except ImportError:
 # Import shared utilities from initial_analyzer
 from app.services.initial_analyzer import normalize_contract_type, get_gemini_api_key
 
+# Maximum defined terms included in a single batch prompt
+MAX_PROMPT_TERMS = 15
+
+# Cross-referenced paragraphs shown per batch, and characters kept from each
+MAX_CROSS_REF_PARAGRAPHS = 8
+CROSS_REF_EXCERPT_CHARS = 500
+
 
 class ForkedParallelAnalyzer:
     """
@@ -99,6 +115,78 @@ class ForkedParallelAnalyzer:
         self.primary_model = "gemini-3-flash-preview"
         self.fallback_model = "gemini-3-pro-preview"
 
+    @staticmethod
+    def _prepare_indexes(all_paragraphs: List[Dict], initial_context: Dict) -> Dict[str, Any]:
+        """
+        Build the document-wide lookups shared by every batch prompt.
+
+        Args:
+            all_paragraphs: All paragraphs in document
+            initial_context: Context from initial analysis
+
+        Returns:
+            Dict with para_lookup, categories_by_para, term_keys/term_entries
+            and term_automaton
+        """
+        risk_category_map = initial_context.get('risk_category_map', {})
+
+        # Invert the category map so each batch only touches its own paragraphs
+        categories_by_para = defaultdict(list)
+        for order, (cat_name, cat_info) in enumerate(risk_category_map.items()):
+            for para_id in set(cat_info.get('para_ids', [])):
+                categories_by_para[para_id].append((order, cat_name))
+
+        # Parallel lists: the substring scan only walks the short lowercase
+        # keys, and a hit's index picks out the full term entry
+        term_entries = [t for t in initial_context.get('defined_terms', []) if t.get('term')]
+        term_keys = [t['term'].lower() for t in term_entries]
+
+        # One automaton scans a batch for every term at once. Each key maps
+        # to all of its entries: add_word keeps only the last value for a
+        # key, and a term may be defined twice or in two casings
+        term_automaton = None
+        if HAS_AHOCORASICK and term_keys:
+            entries_by_key = defaultdict(list)
+            for i, term_key in enumerate(term_keys):
+                entries_by_key[term_key].append(i)
+            term_automaton = ahocorasick.Automaton()
+            for term_key, indices in entries_by_key.items():
+                term_automaton.add_word(term_key, indices)
+            term_automaton.make_automaton()
+
+        return {
+            'para_lookup': {p.get('id'): p for p in all_paragraphs},
+            'categories_by_para': categories_by_para,
+            'term_keys': term_keys,
+            'term_entries': term_entries,
+            'term_automaton': term_automaton,
+        }
+
+    @staticmethod
+    def _find_relevant_terms(batch: List[Dict], indexes: Dict[str, Any]) -> List[Dict]:
+        """
+        Defined terms used anywhere in the batch text.
+
+        Only the first MAX_PROMPT_TERMS in definition order are returned.
+        Both paths scan the same joined text, so the automaton and the
+        substring fallback return the same entries.
+        """
+        term_keys = indexes['term_keys']
+        term_entries = indexes['term_entries']
+        term_automaton = indexes.get('term_automaton')
+        if not term_keys:
+            return []
+        batch_text = " ".join([p.get('text', '') for p in batch]).lower()
+        if term_automaton is not None:
+            found = set()
+            for _, indices in term_automaton.iter(batch_text):
+                found.update(indices)
+            return [term_entries[i] for i in sorted(found)[:MAX_PROMPT_TERMS]]
+        return list(islice(
+            (term_entries[i] for i, term_key in enumerate(term_keys) if term_key in batch_text),
+            MAX_PROMPT_TERMS
+        ))
+
     def build_batch_prompt_v3(
         self,
         batch: List[Dict],
@@ -107,7 +195,8 @@ class ForkedParallelAnalyzer:
         total_batches: int,
         initial_context: Dict,
         representation: str,
-        contract_type: str
+        contract_type: str,
+        indexes: Optional[Dict[str, Any]] = None
     ) -> str:
         """
         Build the v3 batch prompt with condensed context.
@@ -120,6 +209,7 @@ class ForkedParallelAnalyzer:
             initial_context: Context from initial analysis (paragraph_map, risk_category_map, defined_terms)
             representation: Who we represent
             contract_type: Type of contract
+            indexes: Prebuilt lookups from _prepare_indexes (built here if omitted)
 
         Returns:
             Formatted prompt string for this batch
@@ -129,7 +219,8 @@ class ForkedParallelAnalyzer:
 
         paragraph_map = initial_context.get('paragraph_map', {})
         risk_category_map = initial_context.get('risk_category_map', {})
-        defined_terms = initial_context.get('defined_terms', [])
+        if indexes is None:
+            indexes = self._prepare_indexes(all_paragraphs, initial_context)
 
         batch_para_ids = set(p.get('id') for p in batch)
 
@@ -141,23 +232,26 @@ class ForkedParallelAnalyzer:
             cross_ref_ids.update(cross_refs)
         cross_ref_ids -= batch_para_ids
 
-        # Get cross-referenced paragraph objects
-        para_lookup = {p.get('id'): p for p in all_paragraphs}
-        cross_ref_paragraphs = [para_lookup[pid] for pid in cross_ref_ids if pid in para_lookup]
-
-        # Find which risk categories are implicated in this batch
-        relevant_categories = {}
-        for cat_name, cat_info in risk_category_map.items():
-            cat_para_ids = set(cat_info.get('para_ids', []))
-            if cat_para_ids & batch_para_ids:
-                relevant_categories[cat_name] = cat_info
+        # Get cross-referenced paragraph objects; only the first
+        # MAX_CROSS_REF_PARAGRAPHS are shown, so stop collecting there
+        para_lookup = indexes['para_lookup']
+        cross_ref_paragraphs = list(islice(
+            (para_lookup[pid] for pid in cross_ref_ids if pid in para_lookup),
+            MAX_CROSS_REF_PARAGRAPHS
+        ))
+
+        # Find which risk categories are implicated in this batch (in map order)
+        categories_by_para = indexes['categories_by_para']
+        implicated = set()
+        for para_id in batch_para_ids:
+            implicated.update(categories_by_para.get(para_id, ()))
+        relevant_categories = {
+            cat_name: risk_category_map[cat_name]
+            for _, cat_name in sorted(implicated)
+        }
 
         # Find relevant defined terms (full text)
-        batch_text = " ".join([p.get('text', '') for p in batch]).lower()
-        relevant_terms = [
-            t for t in defined_terms
-            if t.get('term', '').lower() in batch_text
-        ]
+        relevant_terms = self._find_relevant_terms(batch, indexes)
 
         # Build the prompt
         paragraphs_text = "\n\n".join([
@@ -182,10 +276,10 @@ class ForkedParallelAnalyzer:
         cross_ref_text = ""
         if cross_ref_paragraphs:
             cross_ref_text = "\n═══════════════════════════════════════════════════════════════════════════════\nCROSS-REFERENCED PARAGRAPHS\n═══════════════════════════════════════════════════════════════════════════════\n"
-            for p in cross_ref_paragraphs[:8]:
+            for p in cross_ref_paragraphs:
                 info = paragraph_map.get(p.get('id'), {})
                 text = p.get('text', '')
-                cross_ref_text += f"\n[{p.get('id')}] ({info.get('caption', 'No caption')})\n{text[:500]}{'...' if len(text) > 500 else ''}\n"
+                cross_ref_text += f"\n[{p.get('id')}] ({info.get('caption', 'No caption')})\n{text[:CROSS_REF_EXCERPT_CHARS]}{'...' if len(text) > CROSS_REF_EXCERPT_CHARS else ''}\n"
 
         # Risk categories implicated
         risk_cats_text = ""
@@ -200,7 +294,7 @@ class ForkedParallelAnalyzer:
         if relevant_terms:
             terms_text = "\n".join([
                 f"• \"{t.get('term')}\": {t.get('definition', 'N/A')}"
-                for t in relevant_terms[:15]
+                for t in relevant_terms
             ])
         else:
             terms_text = "(No defined terms found in this batch)"
@@ -271,7 +365,8 @@ Return as JSON:
         total_batches: int,
         initial_context: Dict,
         representation: str = "Seller",
-        contract_type: str = "Purchase and Sale Agreement"
+        contract_type: str = "Purchase and Sale Agreement",
+        indexes: Optional[Dict[str, Any]] = None
     ) -> Dict[str, Any]:
         """
         Analyze a batch using Gemini with v3 condensed context.
@@ -284,6 +379,7 @@ Return as JSON:
             initial_context: Context from initial analysis
             representation: Who we represent
             contract_type: Type of contract
+            indexes: Prebuilt lookups from _prepare_indexes
 
         Returns:
             Dict with success status, batch_num, response or error, paragraph_ids
@@ -299,7 +395,8 @@ Return as JSON:
                         total_batches=total_batches,
                         initial_context=initial_context,
                         representation=representation,
-                        contract_type=contract_type
+                        contract_type=contract_type,
+                        indexes=indexes
                     )
 
                     # Configure Gemini generation
@@ -452,6 +549,9 @@ Return as JSON:
         }
         print(f"[GEMINI API] Starting parallel batches: {json.dumps(start_summary)}", flush=True)
 
+        # Build document-wide lookups once rather than per batch
+        indexes = self._prepare_indexes(all_paragraphs, initial_context)
+
         async def process_batch(batch_idx: int, batch: List[Dict]):
             result = await self.analyze_batch_fork(
                 batch=batch,
@@ -460,7 +560,8 @@ Return as JSON:
                 total_batches=len(batches),
                 initial_context=initial_context,
                 representation=representation,
-                contract_type=contract_type
+                contract_type=contract_type,
+                indexes=indexes
             )
 
             async with self.progress_lock:
@@ -0,0 +1,76 @@
+"""
+Source-keyed Cache for Fitted Indexes
+
+Services that fit an index over a parsed document (TF-IDF matchers,
+retrievers) reuse the fit across the per-paragraph requests of a session.
+Entries are keyed on the identity of the source list and are only reused
+while that same list, at the same length, is passed back in.
+
+Usage:
+    from app.services.source_cache import SourceCache, release_source
+
+    _MATCHER_CACHE = SourceCache()
+    matcher = _MATCHER_CACHE.get_or_build(precedent_content, build_matcher)
+
+    # When a session is discarded, drop every fit built from its documents
+    release_source(precedent_content)
+"""
+
+import threading
+from typing import Any, Callable, Dict, List, Tuple
+
+# Every cache created, so release_source can clear a document from all of them
+_ALL_CACHES: List['SourceCache'] = []
+
+
+class SourceCache:
+    """
+    Small FIFO cache of values built from a source list, safe across request threads.
+
+    The cache holds a reference to each source so its id() cannot be reused
+    by another list while the entry is alive; the oldest entry is evicted
+    once maxsize is reached.
+    """
+
+    def __init__(self, maxsize: int = 8):
+        self.maxsize = maxsize
+        self._entries: Dict[Tuple, Tuple[List, int, Any]] = {}
+        self._lock = threading.Lock()
+        _ALL_CACHES.append(self)
+
+    def get_or_build(self, source: List, build: Callable[[], Any], *key_extra) -> Any:
+        """
+        Return the value cached for source (and key_extra), building it on a miss.
+
+        build runs outside the lock, so two threads missing on the same source
+        may both build; the later result replaces the earlier one.
+        """
+        key = (id(source),) + key_extra
+        with self._lock:
+            cached = self._entries.get(key)
+            if cached and cached[0] is source and cached[1] == len(source):
+                return cached[2]
+
+        value = build()
+
+        with self._lock:
+            # Evict the oldest entries once the cache is full
+            if key not in self._entries:
+                while self._entries and len(self._entries) >= self.maxsize:
+                    self._entries.pop(next(iter(self._entries)), None)
+            self._entries[key] = (source, len(source), value)
+        return value
+
+    def discard(self, source: List) -> None:
+        """Drop every entry built from source."""
+        with self._lock:
+            for key in [k for k, entry in self._entries.items() if entry[0] is source]:
+                del self._entries[key]
+
+
+def release_source(source: List) -> None:
+    """Drop cached fits built from source in every cache."""
+    if source is None:
+        return
+    for cache in _ALL_CACHES:
+        cache.discard(source)
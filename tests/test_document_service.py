@@ -0,0 +1,106 @@
+# tests/test_document_service.py
+import pytest
+import re
+import sys
+from itertools import product
+from pathlib import Path
+
+# Add app to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.services.document_service import extract_section_number, extract_caption, parse_paragraph_head
+
+
+# Reference implementation: the original one-pattern-at-a-time matcher that
+# _SECTION_NUMBER_RE replaced. Kept verbatim so the rewrite can be compared.
+REFERENCE_PATTERNS = [
+    (r'^(ARTICLE\s+[IVXLCDM]+)[.\s:]+(.*)$', 'article'),
+    (r'^(Article\s+[IVXLCDM]+)[.\s:]+(.*)$', 'article'),
+    (r'^(ARTICLE\s+\d+)[.\s:]+(.*)$', 'article'),
+    (r'^(Article\s+\d+)[.\s:]+(.*)$', 'article'),
+    (r'^(Section\s+[\d]+\.[\d\.A-Za-z\(\)]+)[.\s:]+(.*)$', 'section'),
+    (r'^(Section\s+[\d]+)[.\s:]+(.*)$', 'section'),
+    (r'^(SECTION\s+[\d]+\.[\d\.A-Za-z\(\)]+)[.\s:]+(.*)$', 'section'),
+    (r'^(SECTION\s+[\d]+)[.\s:]+(.*)$', 'section'),
+    (r'^(\d+\.\d+\.\d+\.?\s*)(.*)$', 'subsub'),
+    (r'^(\d+\.\d+\.?\s*)(.*)$', 'sub'),
+    (r'^(\d+\.)\s+(.*)$', 'top'),
+    (r'^([A-Z]\.)\s+(.*)$', 'letter_upper'),
+    (r'^([a-z]\.)\s+(.*)$', 'letter_lower'),
+    (r'^\(([A-Z])\)\s*(.*)$', 'paren_upper'),
+    (r'^\(([a-z])\)\s*(.*)$', 'paren_lower'),
+    (r'^\((\d+)\)\s*(.*)$', 'paren_num'),
+    (r'^\(([ivxlcdm]+)\)\s*(.*)$', 'roman_lower'),
+    (r'^\(([IVXLCDM]+)\)\s*(.*)$', 'roman_upper'),
+]
+
+
+def reference_extract_section_number(text):
+    text = text.strip()
+    for pattern, num_type in REFERENCE_PATTERNS:
+        flags = re.IGNORECASE if num_type in ('article', 'section') else 0
+        match = re.match(pattern, text, flags)
+        if match:
+            section_num = match.group(1).strip()
+            remaining = match.group(2).strip() if match.lastindex >= 2 else ""
+            if num_type.startswith('paren') or num_type.startswith('roman'):
+                if not section_num.startswith('('):
+                    section_num = f"({section_num})"
+            return (section_num, remaining, num_type)
+    return (None, text, None)
+
+
+def reference_extract_caption(text, max_length=60):
+    section_num, remaining, _ = reference_extract_section_number(text)
+    text_to_use = remaining if remaining else text
+
+    caption_match = re.match(r'^([^.]+\.)\s{2,}', text_to_use)
+    if caption_match:
+        return caption_match.group(1).strip()
+
+    first_sentence = re.match(r'^([^.]+\.)', text_to_use)
+    if first_sentence and len(first_sentence.group(1)) <= max_length:
+        return first_sentence.group(1).strip()
+
+    if len(text_to_use) > max_length:
+        return text_to_use[:max_length].strip() + "..."
+
+    return text_to_use.strip() if text_to_use.strip() else None
+
+
+HEADS = [
+    'ARTICLE IV', 'Article 3', 'article xii', 'ARTICLE 12:', 'Article civil',
+    'Section 1.2', 'SECTION 4', 'section 2.3(a)', 'Section 5.1.A', 'Section 7',
+    '1.2.3', '1.2.3.', '1.2', '1.2.', '1.', '12.', '10.1.1.1', '1.a',
+    'A.', 'b.', 'I.', 'iv.', '(A)', '(a)', '(1)', '(12)', '(iv)', '(IV)',
+    '(x)', '(v)', '(i)', '(c)', '(C)', '(iv', '(a', '7)',
+    '\uff11.', '\u0661.5', '(\u0663)', '\u017fection 4', '\u00c9.',
+    'Exhibit A', 'WHEREAS', '"Purchase Price"', 'Sec 1', '', '  ',
+]
+
+TAILS = [
+    '', ' ', ' Definitions.  The following terms apply.',
+    '  Title. Seller shall deliver title.', ': Closing',
+    '.Foo bar', '\tTab. here', '\nSecond line.',
+    ' Purchaser shall pay the "Purchase Price" within ten (10) days.',
+    ' ' + 'word ' * 20,
+]
+
+CASES = [head + tail for head, tail in product(HEADS, TAILS)]
+
+
+def test_extract_section_number_matches_reference():
+    """Test that the single-alternation matcher agrees with the original pattern loop."""
+    for text in CASES:
+        assert extract_section_number(text) == reference_extract_section_number(text), repr(text)
+
+
+@pytest.mark.parametrize('max_length', [20, 60])
+def test_paragraph_head_matches_reference(max_length):
+    """Test that caption extraction agrees with the original, alone and in parse_paragraph_head."""
+    for text in CASES:
+        expected_caption = reference_extract_caption(text, max_length)
+        assert extract_caption(text, max_length) == expected_caption, repr(text)
+        assert parse_paragraph_head(text, max_length) == (
+            *reference_extract_section_number(text), expected_caption
+        ), repr(text)
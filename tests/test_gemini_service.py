@@ -0,0 +1,125 @@
+# tests/test_gemini_service.py
+import pytest
+import sys
+from pathlib import Path
+from typing import Dict
+
+# Add app to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.models import ConceptMap, RiskMap
+from app.services.gemini_service import build_revision_prompt
+
+
+def sample_concept_map() -> Dict:
+    cm = ConceptMap()
+    cm.add_provision(category='liability_limitations', key='cap', value='$1,000,000', section='9.1')
+    return cm.to_dict()
+
+
+def sample_risk_map() -> Dict:
+    rm = RiskMap()
+    risk = rm.add_risk('R1', '5.1', 'p_1', 'Broad indemnity', 'Uncapped indemnity', 'high')
+    risk.add_mitigator('9.1:cap', 'Cap limits exposure')
+    return rm.to_dict()
+
+
+RISKS = [{'risk_id': 'R1', 'type': 'indemnity', 'description': 'Uncapped'}, {'title': 'Untyped'}]
+
+RELATED_CLAUSES = [
+    {'id': 'p_2', 'section_ref': '2.1', 'text': 'Related text', 'revised_text': 'Revised related text'},
+    {'text': 'Clause without id'},
+]
+
+# Every optional input, set
+FULL_INPUTS = {
+    'section_hierarchy': [{'number': '5.', 'caption': 'Closing'}, {'number': '5.1'}],
+    'risks': RISKS,
+    'precedent_clause': 'Seller shall "reasonably" cooperate.',
+    'custom_instruction': 'Add a materiality qualifier.',
+    'deal_context': 'Seller-side PSA for an office building.',
+    'related_clauses': RELATED_CLAUSES,
+    'concept_map': sample_concept_map(),
+    'risk_map': sample_risk_map(),
+}
+
+# Every optional input, empty
+EMPTY_INPUTS = {
+    'section_hierarchy': [],
+    'risks': [],
+    'precedent_clause': None,
+    'custom_instruction': '',
+    'deal_context': '',
+    'related_clauses': None,
+    'concept_map': None,
+    'risk_map': None,
+}
+
+# Headings of the body sections, in the order they must appear
+SECTION_ORDER = [
+    'TARGET SECTION:', 'PREFERRED PRECEDENT:', 'IDENTIFIED RISKS:', 'RELATED CLAUSES',
+    'DEAL CONTEXT:', 'SPECIFIC INSTRUCTION:', 'TASK:',
+]
+
+# Heading that each optional input adds to the prompt
+OPTIONAL_SECTIONS = [
+    ('precedent_clause', 'PREFERRED PRECEDENT:'),
+    ('risks', 'IDENTIFIED RISKS:'),
+    ('related_clauses', 'RELATED CLAUSES'),
+    ('related_clauses', 'add an entry to "related_revisions" array'),
+    ('deal_context', 'DEAL CONTEXT:'),
+    ('custom_instruction', 'SPECIFIC INSTRUCTION:'),
+    ('concept_map', '## Document Context'),
+    ('concept_map', 'Consider the Document Context above:'),
+]
+
+
+def prompt(**overrides) -> str:
+    """Build a prompt for a fixed clause with EMPTY_INPUTS, updated by overrides."""
+    kwargs = dict(EMPTY_INPUTS, **overrides)
+    return build_revision_prompt('Seller shall indemnify {Buyer}.', '5.1', **kwargs)
+
+
+@pytest.mark.parametrize('key,heading', OPTIONAL_SECTIONS)
+def test_optional_section_appears_only_with_its_input(key, heading):
+    """Test that each optional section is written once when its input is given, and never otherwise."""
+    assert heading not in prompt()
+    assert prompt(**{key: FULL_INPUTS[key]}).count(heading) == 1
+    assert prompt(**FULL_INPUTS).count(heading) == 1
+
+
+def test_risk_context_needs_risks_with_ids():
+    """Test that the risk matrix is written only for risks that carry a risk_id."""
+    risk_map = FULL_INPUTS['risk_map']
+    assert '## Risk Context' not in prompt(risk_map=risk_map)
+    assert '## Risk Context' not in prompt(risk_map=risk_map, risks=[{'title': 'Untyped'}])
+    assert prompt(risk_map=risk_map, risks=RISKS).count('## Risk Context') == 1
+
+
+def test_required_sections_always_present():
+    """Test that the target clause and task are written even with every optional input empty."""
+    text = prompt()
+    assert 'TARGET SECTION: 5.1\nHIERARCHY: Unknown Section\n' in text
+    assert 'TARGET CLAUSE:\n"Seller shall indemnify {Buyer}."\n' in text
+    assert text.count('TASK:') == 1
+    assert text.rstrip().endswith('Priority should be "recommended" (should do) or "optional" (nice to have).')
+
+
+def test_sections_follow_fixed_order():
+    """Test that context comes first and body sections run TARGET to TASK in order."""
+    text = prompt(**FULL_INPUTS)
+    positions = [text.index(heading) for heading in SECTION_ORDER]
+    assert positions == sorted(positions)
+    assert text.index('## Document Context') < text.index('## Risk Context') < positions[0]
+
+
+def test_section_contents():
+    """Test the lines written for the hierarchy, risks and related clauses."""
+    text = prompt(**FULL_INPUTS)
+    assert 'HIERARCHY: 5. Closing > 5.1 \n' in text
+    assert 'PREFERRED PRECEDENT:\n"Seller shall "reasonably" cooperate."\n' in text
+    assert 'IDENTIFIED RISKS:\n- indemnity: Uncapped\n- Untyped: \n' in text
+    assert '\n--- [p_2] 2.1 ---\nFULL TEXT: Related text\n(Already revised to: Revised related text)\n' in text
+    assert '\n--- [related_1]  ---\nFULL TEXT: Clause without id\n\n' in text
+    assert 'DEAL CONTEXT:\nSeller-side PSA for an office building.\n' in text
+    assert 'SPECIFIC INSTRUCTION:\nAdd a materiality qualifier.\n' in text
@@ -0,0 +1,44 @@
+# tests/test_parallel_analyzer.py
+import pytest
+import sys
+from pathlib import Path
+
+# Add app to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.services import parallel_analyzer
+from app.services.parallel_analyzer import ForkedParallelAnalyzer
+
+
+DEFINED_TERMS = [
+    {'term': 'Seller', 'definition': 'ABC Holdings LLC'},
+    {'term': 'Deposit', 'definition': 'The earnest money deposit'},
+    {'term': 'Purchase Price', 'definition': 'Ten Million Dollars'},
+    {'term': 'SELLER', 'definition': 'ABC Holdings LLC and its affiliates'},
+    {'term': 'Closing Date', 'definition': 'The date of Closing'},
+]
+
+BATCH = [
+    {'id': 'p_1', 'text': 'Seller shall return the Deposit.'},
+    {'id': 'p_2', 'text': 'The Purchase'},
+    {'id': 'p_3', 'text': 'Price is payable at Closing.'},
+]
+
+
+def relevant_terms(monkeypatch, use_automaton):
+    """Relevant terms for BATCH with or without the Aho-Corasick automaton."""
+    monkeypatch.setattr(parallel_analyzer, 'HAS_AHOCORASICK', use_automaton)
+    indexes = ForkedParallelAnalyzer._prepare_indexes(BATCH, {'defined_terms': DEFINED_TERMS})
+    assert (indexes['term_automaton'] is not None) == use_automaton
+    return ForkedParallelAnalyzer._find_relevant_terms(BATCH, indexes)
+
+
+def test_duplicate_defined_terms_match_substring_fallback(monkeypatch):
+    """Test that a term defined twice keeps both entries on both paths."""
+    pytest.importorskip('ahocorasick')
+
+    with_automaton = relevant_terms(monkeypatch, True)
+    without_automaton = relevant_terms(monkeypatch, False)
+
+    assert with_automaton == without_automaton
+    assert [t['term'] for t in with_automaton] == ['Seller', 'Deposit', 'Purchase Price', 'SELLER']